@@ -1,19 +1,27 @@
 import os
+import shutil
 
 folder_path = "."  # المجلد الحالي
 output_file = "all_codes.txt"
 
-with open(output_file, "w", encoding="utf-8") as out:
+# نسخ ثنائي على دفعات 64KB بدون فك/إعادة ترميز النص
+CHUNK_SIZE = 64 * 1024
+
+with open(output_file, "wb") as out:
     for filename in os.listdir(folder_path):
         file_path = os.path.join(folder_path, filename)
 
+        # تجاهل ملف الإخراج نفسه (نسخه إلى نفسه لا ينتهي)
+        if filename == output_file:
+            continue
+
         if os.path.isfile(file_path):
-            out.write(f"===== {filename} =====\n")
+            out.write(f"===== {filename} =====\n".encode("utf-8"))
 
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    out.write(f.read())
-            except Exception as e:
-                out.write(f"[لا يمكن قراءة الملف: {e}]")
+                with open(file_path, "rb") as f:
+                    shutil.copyfileobj(f, out, length=CHUNK_SIZE)
+            except OSError as e:
+                out.write(f"[لا يمكن قراءة الملف: {e}]".encode("utf-8"))
 
-            out.write("\n\n")
+            out.write(b"\n\n")
@@ -0,0 +1,99 @@
+"""
+Threaded camera capture.
+
+A background thread keeps reading from the camera and only the newest frame is
+kept (LIFO). Consumers never wait on the driver: `read()` returns as soon as a
+frame newer than the previous one is available, and stale frames are dropped.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from camera_diag import open_low_latency_capture
+
+
+class ThreadedCapture:
+    """
+    Producer/consumer wrapper around `cv2.VideoCapture`.
+
+    Mirrors the small part of the VideoCapture API the scripts use
+    (`isOpened`, `read`, `release`) so it can be swapped in directly.
+    """
+
+    def __init__(self, camera_id: int = 0):
+        self.camera_id = camera_id
+        self._cap: cv2.VideoCapture = open_low_latency_capture(camera_id)
+
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._stop_event = threading.Event()
+        self._latest: Optional[np.ndarray] = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def isOpened(self) -> bool:
+        return self._cap.isOpened()
+
+    def start(self) -> bool:
+        """Start the reader thread. Returns False if the camera is not open."""
+        if not self._cap.isOpened():
+            return False
+        self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            ret, frame = self._cap.read()
+            if not ret:
+                # Retry soon, without spinning on a failed / unplugged camera;
+                # returns at once when stop() is called.
+                self._stop_event.wait(0.001)
+                continue
+            with self._lock:
+                self._latest = frame
+            self._new_frame.set()
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Return the newest frame not yet returned.
+
+        Like `cv2.VideoCapture.read()`, this waits for a frame: a slow camera
+        (some take over a second for the first one) is not a failure.
+
+        Args:
+            timeout: Seconds to wait at most (None: until a frame arrives).
+
+        Returns:
+            (ok, frame) like `cv2.VideoCapture.read()`. ok is False once the
+            reader thread has stopped or the camera is closed, or after
+            `timeout`.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._new_frame.wait(0.1):
+            if not self._thread.is_alive() or not self._cap.isOpened():
+                return False, None
+            if deadline is not None and time.monotonic() >= deadline:
+                return False, None
+        self._new_frame.clear()
+        with self._lock:
+            frame = self._latest
+        return frame is not None, frame
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def join(self, timeout: Optional[float] = 1.0) -> None:
+        if self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+
+    def release(self) -> None:
+        """Stop the reader thread and release the camera."""
+        self.stop()
+        self.join()
+        self._cap.release()
@@ -12,6 +12,11 @@ CAMERA_FRAME_WIDTH = 1280
 CAMERA_FRAME_HEIGHT = 720
 CAMERA_TARGET_FPS = 30
 
+# Width of the copy sent to MediaPipe (aspect ratio kept). The hand models run
+# at 256/224 px internally, so full-resolution input only costs bandwidth.
+# Landmarks are normalized, so they still map onto the full-resolution frame.
+TRACKER_INFERENCE_WIDTH = 480
+
 # -----------------------------
 # UI / Overlay
 # -----------------------------
@@ -73,3 +78,7 @@ EKF_BASE_MEASUREMENT_NOISE = 10.0
 # Speed normalization (normalized units / second)
 EKF_SPEED_FAST = 0.50
 
+# Landmarks whose raw measurement moved less than this (max |dx|,|dy|,|dz|,
+# normalized units) since the previous frame skip the filter step.
+EKF_STATIC_DELTA = 1e-3
+
@@ -4,17 +4,34 @@ Virtual Mouse, Keyboard, and Game Controller
 """
 import pyautogui
 import numpy as np
-from typing import Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
+import math
+import subprocess
 import time
+import warnings
 from pynput.keyboard import Key, Controller as KeyboardController
 import cv2
 
 from constants import CLICK_DEBOUNCE_MS, MOUSE_MOVE_MARGIN
+from mouse_backend import create_mouse_backend
+from numba_compat import njit
 
 
 # Disable PyAutoGUI failsafe
 pyautogui.FAILSAFE = False
 
+# Screen size is a Win32/X11 round trip; query it once per process.
+_SCREEN_SIZE: Optional[Tuple[int, int]] = None
+
+
+def _screen_size() -> Tuple[int, int]:
+    """Return the (cached) primary screen size in pixels"""
+    global _SCREEN_SIZE
+    if _SCREEN_SIZE is None:
+        w, h = pyautogui.size()
+        _SCREEN_SIZE = (int(w), int(h))
+    return _SCREEN_SIZE
+
 
 class VirtualMouse:
     """
@@ -35,9 +52,7 @@ class VirtualMouse:
             smoothing: Smoothing factor (0-1)
         """
         if screen_width is None or screen_height is None:
-            w, h = pyautogui.size()
-            screen_width = int(w)
-            screen_height = int(h)
+            screen_width, screen_height = _screen_size()
 
         self.screen_width = int(screen_width)
         self.screen_height = int(screen_height)
@@ -56,7 +71,22 @@ class VirtualMouse:
         self.is_dragging = False
         
         # Active region (to avoid edges)
-        self.margin = float(margin)
+        self.margin = margin
+        
+        # Direct OS cursor API when available (PyAutoGUI otherwise)
+        self._backend = create_mouse_backend()
+    
+    @property
+    def margin(self) -> float:
+        """Inactive border (normalized) on each side of the camera frame"""
+        return self._margin
+    
+    @margin.setter
+    def margin(self, value: float):
+        self._margin = float(value)
+        # Precomputed active-region bounds and reciprocal span
+        self._hi = 1.0 - self._margin
+        self._inv_span = 1.0 / (1.0 - 2.0 * self._margin)
     
     def move_cursor(self, x: float, y: float):
         """
@@ -67,12 +97,13 @@ class VirtualMouse:
             y: Normalized y coordinate
         """
         # Apply margins
-        x = np.clip(x, self.margin, 1 - self.margin)
-        y = np.clip(y, self.margin, 1 - self.margin)
+        lo = self._margin
+        x = min(max(x, lo), self._hi)
+        y = min(max(y, lo), self._hi)
         
         # Normalize to active region
-        x = (x - self.margin) / (1 - 2 * self.margin)
-        y = (y - self.margin) / (1 - 2 * self.margin)
+        x = (x - lo) * self._inv_span
+        y = (y - lo) * self._inv_span
         
         # Convert to screen coordinates
         screen_x = int(x * self.screen_width)
@@ -82,8 +113,10 @@ class VirtualMouse:
         smooth_x = int(self.smoothing * screen_x + (1 - self.smoothing) * self.prev_x)
         smooth_y = int(self.smoothing * screen_y + (1 - self.smoothing) * self.prev_y)
         
-        # Move cursor
-        pyautogui.moveTo(smooth_x, smooth_y, duration=0)
+        # Move cursor (skip the OS call when the position has not changed)
+        if smooth_x == self.prev_x and smooth_y == self.prev_y:
+            return
+        self._backend.move(smooth_x, smooth_y)
         
         # Update previous position
         self.prev_x = smooth_x
@@ -96,14 +129,14 @@ class VirtualMouse:
         Args:
             button: 'left', 'right', or 'middle'
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_click_time > self.click_cooldown:
-            pyautogui.click(button=button)
+            self._backend.click(button)
             self.last_click_time = current_time
     
     def double_click(self):
         """Perform double click"""
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_click_time > self.click_cooldown:
             pyautogui.doubleClick()
             self.last_click_time = current_time
@@ -111,13 +144,13 @@ class VirtualMouse:
     def start_drag(self):
         """Start dragging"""
         if not self.is_dragging:
-            pyautogui.mouseDown()
+            self._backend.press("left")
             self.is_dragging = True
     
     def stop_drag(self):
         """Stop dragging"""
         if self.is_dragging:
-            pyautogui.mouseUp()
+            self._backend.release("left")
             self.is_dragging = False
     
     def scroll(self, amount: int):
@@ -140,6 +173,9 @@ class VirtualKeyboard:
         self.keyboard = KeyboardController()
         self.last_key_time = 0
         self.key_cooldown = 0.2  # seconds
+        
+        # Special key names ('space', 'enter', ...) resolved once
+        self._key_table: Dict[str, Key] = dict(Key.__members__)
     
     def press_key(self, key: str):
         """
@@ -148,15 +184,12 @@ class VirtualKeyboard:
         Args:
             key: Key to press (e.g., 'a', 'space', 'enter')
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_key_time > self.key_cooldown:
             try:
-                if hasattr(Key, key):
-                    self.keyboard.press(getattr(Key, key))
-                    self.keyboard.release(getattr(Key, key))
-                else:
-                    self.keyboard.press(key)
-                    self.keyboard.release(key)
+                k = self._key_table.get(key, key)
+                self.keyboard.press(k)
+                self.keyboard.release(k)
                 self.last_key_time = current_time
             except Exception as e:
                 print(f"Error pressing key {key}: {e}")
@@ -177,6 +210,10 @@ class VirtualKeyboard:
 class VolumeController:
     """
     System Volume Controller using hand gestures
+    
+    Talks to the mixer through native bindings when available
+    (pyalsaaudio on Linux, pycaw on Windows) and falls back to
+    spawning `amixer` otherwise.
     """
     
     def __init__(self):
@@ -184,6 +221,38 @@ class VolumeController:
         self.current_volume = 50  # 0-100
         self.last_update_time = 0
         self.update_cooldown = 0.1  # seconds
+        
+        self._set_system_volume = self._open_mixer()
+    
+    def _open_mixer(self) -> Callable[[int], None]:
+        """Return a function that sets the system volume (0-100)"""
+        try:
+            import alsaaudio
+            mixer = alsaaudio.Mixer('Master')
+            return mixer.setvolume
+        except Exception:
+            pass
+        
+        try:
+            from ctypes import POINTER, cast
+            from comtypes import CLSCTX_ALL
+            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+            
+            interface = AudioUtilities.GetSpeakers().Activate(
+                IAudioEndpointVolume._iid_, CLSCTX_ALL, None
+            )
+            endpoint = cast(interface, POINTER(IAudioEndpointVolume))
+            return lambda volume: endpoint.SetMasterVolumeLevelScalar(volume / 100.0, None)
+        except Exception:
+            pass
+        
+        return self._amixer_set_volume
+    
+    @staticmethod
+    def _amixer_set_volume(volume: int):
+        """Fallback: spawn amixer (Linux)"""
+        subprocess.run(['amixer', 'set', 'Master', f'{volume}%'],
+                       capture_output=True)
     
     def set_volume(self, distance: float):
         """
@@ -192,7 +261,7 @@ class VolumeController:
         Args:
             distance: Distance between fingers (0-1)
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_update_time > self.update_cooldown:
             # Map distance to volume (0-100)
             volume = int(np.clip(distance * 300, 0, 100))
@@ -201,12 +270,9 @@ class VolumeController:
                 self.current_volume = volume
                 self.last_update_time = current_time
                 
-                # On Linux, use amixer
                 try:
-                    import subprocess
-                    subprocess.run(['amixer', 'set', 'Master', f'{volume}%'], 
-                                 capture_output=True)
-                except:
+                    self._set_system_volume(volume)
+                except Exception:
                     pass
     
     def get_volume(self) -> int:
@@ -257,7 +323,7 @@ class GameController:
         Args:
             action_name: 'jump', 'action', 'attack'
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_action_time > self.action_cooldown:
             if action_name in self.key_map:
                 key = self.key_map[action_name]
@@ -267,6 +333,65 @@ class GameController:
                 self.last_action_time = current_time
 
 
+@njit(cache=True, fastmath=True)
+def _smooth_point(x_ring, y_ring, weights, count):
+    """Weighted average of the first `count` ring slots, truncated to pixels."""
+    sx = 0.0
+    sy = 0.0
+    for i in range(count):
+        sx += x_ring[i] * weights[i]
+        sy += y_ring[i] * weights[i]
+    return int(sx), int(sy)
+
+
+@njit(cache=True, fastmath=True)
+def _update_kernel_fixed(x_ring, y_ring, weights, count, last_x, last_y, min_dist_sq):
+    """
+    Numeric core of `AirDrawing.update` with a fixed line thickness.
+
+    Returns:
+        (smooth_x, smooth_y, far_enough)
+    """
+    smooth_x, smooth_y = _smooth_point(x_ring, y_ring, weights, count)
+    dx = last_x - smooth_x
+    dy = last_y - smooth_y
+    # مقارنة مربع المسافة بمربع الحد الأدنى (بدون جذر تربيعي)
+    far_enough = dx * dx + dy * dy >= min_dist_sq
+    return smooth_x, smooth_y, far_enough
+
+
+@njit(cache=True, fastmath=True)
+def _update_kernel_adaptive(x_ring, y_ring, weights, count, last_x, last_y, min_dist_sq,
+                            thickness, min_t, max_t, time_delta):
+    """
+    Numeric core of `AirDrawing.update` with speed-adaptive line thickness.
+
+    Returns:
+        (smooth_x, smooth_y, far_enough, thickness)
+    """
+    smooth_x, smooth_y = _smooth_point(x_ring, y_ring, weights, count)
+    dx = last_x - smooth_x
+    dy = last_y - smooth_y
+    d2 = dx * dx + dy * dy
+    far_enough = d2 >= min_dist_sq
+
+    # الحركة السريعة = خط أرفع، الحركة البطيئة = خط أسمك
+    # (المسافة الفعلية مطلوبة هنا فقط)
+    if time_delta > 0:
+        speed = math.sqrt(d2) / time_delta  # بكسل/ثانية
+        normalized_speed = min(max(speed / 1000.0, 0.0), 1.0)
+        thickness = max(min_t, int(max_t - normalized_speed * (max_t - min_t)))
+
+    return smooth_x, smooth_y, far_enough, thickness
+
+
+# Compile (or load from cache) at import rather than on the first drawn frame.
+_update_kernel_fixed(np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.float32),
+                     np.ones(1, dtype=np.float32), 1, 0, 0, 9)
+_update_kernel_adaptive(np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.float32),
+                        np.ones(1, dtype=np.float32), 1, 0, 0, 9, 5, 3, 8, 0.0)
+
+
 class AirDrawing:
     """
     Air Drawing using hand tracking - IMPROVED VERSION
@@ -281,6 +406,10 @@ class AirDrawing:
         """
         self.canvas_width, self.canvas_height = canvas_size
         self.canvas = np.zeros((self.canvas_height, self.canvas_width, 3), dtype=np.uint8)
+        # True once anything has been drawn since the last clear
+        self._dirty = False
+        # Bounding box (x0, y0, x1, y1) of the ink drawn since the last clear
+        self._bbox: Optional[Tuple[int, int, int, int]] = None
         
         # Drawing state
         self.is_drawing = False
@@ -292,8 +421,8 @@ class AirDrawing:
         
         # ===== إضافات جديدة للتحسين =====
         
-        # Buffer للنقاط لجعل الخط أكثر سلاسة
-        self.point_buffer = []
+        # Buffer للنقاط لجعل الخط أكثر سلاسة (ring buffer، مصفوفة لكل محور)
+        # تعيين الحجم يُنشئ الـ buffer وجداول الأوزان
         self.buffer_size = 5  # عدد النقاط للتنعيم
         
         # Smoothing factor
@@ -306,118 +435,205 @@ class AirDrawing:
         self.min_distance = 3  # بكسل
         
         # تتبع الوقت لحساب السرعة
-        self.last_update_time = time.time()
+        self.last_update_time = time.monotonic()
         
         # تكيف السمك بناءً على السرعة
-        self.adaptive_thickness = True
+        # (تعيينه يربط self.update بالنسخة المتخصصة المناسبة)
         self.min_thickness = 3
         self.max_thickness = 8
+        self.adaptive_thickness = True
     
-    def _smooth_point(self, new_point: Tuple[int, int]) -> Tuple[int, int]:
-        """
-        تنعيم النقطة باستخدام buffer من النقاط السابقة
+    @property
+    def min_distance(self) -> float:
+        """الحد الأدنى للمسافة (بالبكسل) بين نقطتين مرسومتين"""
+        return self._min_distance
+    
+    @min_distance.setter
+    def min_distance(self, distance: float):
+        self._min_distance = distance
+        # يُقارن به مربع المسافة مباشرة في الـ kernel
+        self._min_distance_sq = distance * distance
+    
+    @property
+    def adaptive_thickness(self) -> bool:
+        """هل يتغير السمك حسب سرعة الحركة"""
+        return self._adaptive_thickness
+    
+    @adaptive_thickness.setter
+    def adaptive_thickness(self, enabled: bool):
+        self._adaptive_thickness = bool(enabled)
+        # المسار الثابت لا يقيس الوقت، لذا نبدأ القياس من الآن
+        self.last_update_time = time.monotonic()
+        self.update = self._update_adaptive if self._adaptive_thickness else self._update_fixed
+    
+    @property
+    def buffer_size(self) -> int:
+        """عدد النقاط المستخدمة في التنعيم"""
+        return self._buffer_size
+    
+    @buffer_size.setter
+    def buffer_size(self, size: int):
+        n = max(1, int(size))
+        self._buffer_size = n
+        self._x_ring = np.zeros(n, dtype=np.float32)
+        self._y_ring = np.zeros(n, dtype=np.float32)
+        
+        # أوزان المتوسط المرجح لكل مستوى امتلاء (النقاط الأحدث لها وزن أكبر)،
+        # ولـ buffer الممتلئ نسخة مُدوَّرة لكل موضع رأس حتى لا نعيد ترتيبه
+        self._weight_table = [None] + [self._norm_linspace(k) for k in range(1, n + 1)]
+        self._weights_by_head = [np.roll(self._weight_table[n], h) for h in range(n)]
+        self._reset_buffer()
+    
+    @staticmethod
+    def _norm_linspace(k: int) -> np.ndarray:
+        """أوزان خطية من 0.5 إلى 1.0 مُطبَّعة بحيث مجموعها 1"""
+        w = np.linspace(0.5, 1.0, k, dtype=np.float32)
+        w /= w.sum()
+        return w
+    
+    def _push_point(self, x: int, y: int) -> np.ndarray:
         """
-        self.point_buffer.append(new_point)
-        
-        # الحفاظ على حجم الـ buffer
-        if len(self.point_buffer) > self.buffer_size:
-            self.point_buffer.pop(0)
+        إضافة نقطة إلى buffer التنعيم وإرجاع الأوزان المطابقة لمواضعه
         
-        # حساب المتوسط المرجح (النقاط الأحدث لها وزن أكبر)
-        if len(self.point_buffer) == 0:
-            return new_point
-        
-        weights = np.linspace(0.5, 1.0, len(self.point_buffer))
-        weights = weights / weights.sum()
+        الإحداثيات تُخزَّن في مصفوفتين متجاورتين (x و y) بدل قائمة tuples
+        """
+        self._x_ring[self._head] = x
+        self._y_ring[self._head] = y
+        self._head = (self._head + 1) % self.buffer_size
+        if self._count < self.buffer_size:
+            self._count += 1
         
-        smooth_x = sum(p[0] * w for p, w in zip(self.point_buffer, weights))
-        smooth_y = sum(p[1] * w for p, w in zip(self.point_buffer, weights))
+        if self._count == self.buffer_size:
+            # الـ buffer ممتلئ: أقدم نقطة في موضع الرأس
+            return self._weights_by_head[self._head]
         
-        return (int(smooth_x), int(smooth_y))
+        # مرحلة الامتلاء: النقاط في المواضع 0..count-1 بالترتيب
+        return self._weight_table[self._count]
     
-    def _calculate_distance(self, p1: Tuple[int, int], p2: Tuple[int, int]) -> float:
-        """حساب المسافة بين نقطتين"""
-        return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
+    def _reset_buffer(self):
+        """تفريغ buffer التنعيم"""
+        self._head = 0
+        self._count = 0
     
-    def _adaptive_thickness_based_on_speed(self, distance: float, time_delta: float) -> int:
+    def _grow_bbox(self, point: Tuple[int, int], thickness: int):
         """
-        حساب سمك الخط بناءً على سرعة الحركة
-        الحركة السريعة = خط أرفع
-        الحركة البطيئة = خط أسمك
+        توسيع مستطيل الحبر ليشمل نقطة مرسومة بالسمك المعطى (مع هامش للـ anti-aliasing)
         """
-        if time_delta <= 0:
-            return self.thickness
-        
-        speed = distance / time_delta  # بكسل/ثانية
-        
-        # تطبيع السرعة (0-1000 بكسل/ثانية)
-        normalized_speed = np.clip(speed / 1000.0, 0, 1)
-        
-        # عكس العلاقة: سرعة عالية = سمك قليل
-        thickness = int(self.max_thickness - normalized_speed * (self.max_thickness - self.min_thickness))
-        
-        return max(self.min_thickness, thickness)
+        pad = thickness // 2 + 2
+        x0 = max(0, point[0] - pad)
+        y0 = max(0, point[1] - pad)
+        x1 = min(self.canvas_width, point[0] + pad + 1)
+        y1 = min(self.canvas_height, point[1] + pad + 1)
+        if self._bbox is None:
+            self._bbox = (x0, y0, x1, y1)
+        else:
+            bx0, by0, bx1, by1 = self._bbox
+            self._bbox = (min(bx0, x0), min(by0, y0), max(bx1, x1), max(by1, y1))
     
     def _draw_smooth_line(self, p1: Tuple[int, int], p2: Tuple[int, int], thickness: int):
         """
         رسم خط ناعم باستخدام Anti-aliasing
         """
         cv2.line(self.canvas, p1, p2, self.color, thickness, cv2.LINE_AA)
+        self._grow_bbox(p1, thickness)
+        self._grow_bbox(p2, thickness)
+    
+    def _end_stroke(self):
+        """إيقاف الرسم - إعادة تعيين الحالة"""
+        self.last_drawn_point = None
+        self._reset_buffer()
+    
+    def _start_stroke(self, point: Tuple[int, int]):
+        """
+        أول نقطة في السكتة: لا يوجد تاريخ للتنعيم، نبدأ من النقطة الخام
+        مباشرة (بدون تأخير) ونجعلها أول نقطة في الـ buffer
+        """
+        self._reset_buffer()
+        self._push_point(point[0], point[1])
+        self.last_drawn_point = point
+        # رسم نقطة صغيرة للبداية
+        cv2.circle(self.canvas, point, self.thickness // 2, self.color, -1)
+        self._grow_bbox(point, self.thickness)
+        self._dirty = True
     
     def update(self, x: float, y: float, is_drawing: bool):
         """
         Update drawing - IMPROVED VERSION
         
+        Each instance rebinds `update` to `_update_adaptive` or `_update_fixed`
+        whenever `adaptive_thickness` is set; this body only runs when called
+        through the class.
+        
         Args:
             x: Normalized x coordinate (0-1)
             y: Normalized y coordinate (0-1)
             is_drawing: Whether to draw
         """
-        current_time = time.time()
+        if self.adaptive_thickness:
+            self._update_adaptive(x, y, is_drawing)
+        else:
+            self._update_fixed(x, y, is_drawing)
+    
+    def _update_adaptive(self, x: float, y: float, is_drawing: bool):
+        """`update` مع سمك يتكيف حسب السرعة"""
+        current_time = time.monotonic()
         time_delta = current_time - self.last_update_time
+        self.last_update_time = current_time
         
         # Convert to canvas coordinates
         canvas_x = int(np.clip(x * self.canvas_width, 0, self.canvas_width - 1))
         canvas_y = int(np.clip(y * self.canvas_height, 0, self.canvas_height - 1))
-        current_point = (canvas_x, canvas_y)
-        
-        # تنعيم النقطة
-        smoothed_point = self._smooth_point(current_point)
         
-        if is_drawing:
-            # إذا كانت هذه أول نقطة في السكتة
-            if self.last_drawn_point is None:
-                self.last_drawn_point = smoothed_point
-                # رسم نقطة صغيرة للبداية
-                cv2.circle(self.canvas, smoothed_point, self.thickness // 2, self.color, -1)
-            else:
-                # حساب المسافة من آخر نقطة مرسومة
-                distance = self._calculate_distance(self.last_drawn_point, smoothed_point)
-                
-                # رسم فقط إذا كانت المسافة كافية (لتجنب النقاط المتراكمة)
-                if distance >= self.min_distance:
-                    # حساب السمك التكيفي بناءً على السرعة
-                    if self.adaptive_thickness:
-                        thickness = self._adaptive_thickness_based_on_speed(distance, time_delta)
-                    else:
-                        thickness = self.thickness
-                    
-                    # رسم خط ناعم
-                    self._draw_smooth_line(self.last_drawn_point, smoothed_point, thickness)
-                    
-                    # تحديث آخر نقطة مرسومة
-                    self.last_drawn_point = smoothed_point
+        if not is_drawing:
+            self._end_stroke()
+        elif self.last_drawn_point is None:
+            self._start_stroke((canvas_x, canvas_y))
         else:
-            # إيقاف الرسم - إعادة تعيين الحالة
-            self.last_drawn_point = None
-            self.point_buffer.clear()
+            # تنعيم النقطة + المسافة + السمك التكيفي في خطوة واحدة مُترجمة
+            weights = self._push_point(canvas_x, canvas_y)
+            last_x, last_y = self.last_drawn_point
+            smooth_x, smooth_y, far_enough, thickness = _update_kernel_adaptive(
+                self._x_ring, self._y_ring, weights, self._count,
+                last_x, last_y, self._min_distance_sq,
+                self.thickness, self.min_thickness, self.max_thickness, time_delta,
+            )
+            
+            # رسم فقط إذا كانت المسافة كافية (لتجنب النقاط المتراكمة)
+            if far_enough:
+                smoothed_point = (smooth_x, smooth_y)
+                # رسم خط ناعم من آخر نقطة
+                self._draw_smooth_line(self.last_drawn_point, smoothed_point, thickness)
+                self.last_drawn_point = smoothed_point
+    
+    def _update_fixed(self, x: float, y: float, is_drawing: bool):
+        """`update` بسمك ثابت (بدون قياس الوقت أو السرعة)"""
+        # Convert to canvas coordinates
+        canvas_x = int(np.clip(x * self.canvas_width, 0, self.canvas_width - 1))
+        canvas_y = int(np.clip(y * self.canvas_height, 0, self.canvas_height - 1))
         
-        self.last_update_time = current_time
+        if not is_drawing:
+            self._end_stroke()
+        elif self.last_drawn_point is None:
+            self._start_stroke((canvas_x, canvas_y))
+        else:
+            weights = self._push_point(canvas_x, canvas_y)
+            last_x, last_y = self.last_drawn_point
+            smooth_x, smooth_y, far_enough = _update_kernel_fixed(
+                self._x_ring, self._y_ring, weights, self._count,
+                last_x, last_y, self._min_distance_sq,
+            )
+            
+            if far_enough:
+                smoothed_point = (smooth_x, smooth_y)
+                self._draw_smooth_line(self.last_drawn_point, smoothed_point, self.thickness)
+                self.last_drawn_point = smoothed_point
     
     def clear_canvas(self):
         """Clear drawing canvas"""
         self.canvas = np.zeros((self.canvas_height, self.canvas_width, 3), dtype=np.uint8)
-        self.point_buffer.clear()
+        self._dirty = False
+        self._bbox = None
+        self._reset_buffer()
         self.last_drawn_point = None
     
     def change_color(self, color: Tuple[int, int, int]):
@@ -449,6 +665,33 @@ class AirDrawing:
         """
         self.adaptive_thickness = enabled
     
+    @property
+    def has_ink(self) -> bool:
+        """Whether anything has been drawn since the canvas was last cleared"""
+        return self._dirty
+    
+    @property
+    def ink_bbox(self) -> Optional[Tuple[int, int, int, int]]:
+        """Bounding box (x0, y0, x1, y1) of everything drawn, or None when empty"""
+        return self._bbox
+    
     def get_canvas(self) -> np.ndarray:
-        """Get current canvas"""
+        """
+        Get current canvas as a read-only view (no copy).
+        
+        Deprecated: read `self.canvas` directly instead.
+        The view aliases the live canvas, so it changes as drawing continues.
+        Use `snapshot_canvas()` when an independent copy is needed.
+        """
+        warnings.warn(
+            "AirDrawing.get_canvas() is deprecated; use .canvas",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        view = self.canvas.view()
+        view.flags.writeable = False
+        return view
+    
+    def snapshot_canvas(self) -> np.ndarray:
+        """Get an independent copy of the current canvas"""
         return self.canvas.copy()
@@ -24,9 +24,15 @@ class DrawMode(BaseMode):
 
     name = "draw"
 
+    # إعدادات نص الحالة (ثابتة)
+    _STATUS_POS = (10, 30)
+    _STATUS_FONT = cv2.FONT_HERSHEY_SIMPLEX
+
     def __init__(self):
         # Canvas size will be adapted on first frame.
         self._drawer: Optional[AirDrawing] = None
+        self._w: int = 0
+        self._h: int = 0
 
         # حالة الرسم الحالية
         self._is_drawing_active: bool = False
@@ -34,10 +40,22 @@ class DrawMode(BaseMode):
         # فترة سماح بسيطة لتجنّب تقطّع الخط (بالثواني)
         self._grace_period_sec: float = 0.15
 
+        # مخرج دمج دائم للإطارات غير القابلة للكتابة (يُخصَّص عند الحاجة فقط)
+        self._blend_out: Optional[np.ndarray] = None
+
+        # نص الحالة يُعاد بناؤه فقط عند تغيّر محتواه
+        self._last_status_key: Optional[tuple] = None
+        self._status_text: str = ""
+
+        # مركز مؤشر الإصبع (يُحدَّث في مكانه كل إطار)
+        self._tip_center = [0, 0]
+
     def ensure_canvas(self, frame: np.ndarray) -> None:
         if self._drawer is not None:
             return
         h, w, _ = frame.shape
+        # أبعاد الإطار ثابتة بعد تحديد حجم اللوحة
+        self._w, self._h = w, h
         self._drawer = AirDrawing((w, h))
         # إذا كانت النسخة المحسّنة من AirDrawing متوفرة فعّل السمك التكيفي
         if hasattr(self._drawer, "set_adaptive_thickness"):
@@ -53,7 +71,7 @@ class DrawMode(BaseMode):
         self.ensure_canvas(frame)
         assert self._drawer is not None
 
-        now = time.time()
+        now = time.monotonic()
         index_tip = tracker.get_finger_tip("index")
 
         if index_tip:
@@ -67,31 +85,58 @@ class DrawMode(BaseMode):
             self._drawer.update(index_tip[0], index_tip[1], self._is_drawing_active)
 
             # مؤشر بسيط على طرف الإصبع
-            h, w = frame.shape[:2]
-            tip_x = int(index_tip[0] * w)
-            tip_y = int(index_tip[1] * h)
+            center = self._tip_center
+            center[0] = int(index_tip[0] * self._w)
+            center[1] = int(index_tip[1] * self._h)
             color = (0, 255, 0) if self._is_drawing_active else (0, 0, 255)
-            cv2.circle(frame, (tip_x, tip_y), 10, color, 2)
-            cv2.circle(frame, (tip_x, tip_y), 3, color, -1)
+            cv2.circle(frame, center, 10, color, 2)
+            cv2.circle(frame, center, 3, color, -1)
         else:
             # لا يوجد إصبع مكتشف لفترة أطول من فترة السماح → أوقف الرسم
             if (now - self._last_point_ts) > self._grace_period_sec:
                 self._is_drawing_active = False
 
-        # دمج اللوحة مع الإطار
-        canvas = self._drawer.get_canvas()
-        frame = cv2.addWeighted(frame, 0.7, canvas, 0.3, 0)
+        # دمج اللوحة مع الإطار (في نفس ذاكرة الإطار بدون تخصيص جديد)
+        # لوحة فارغة لا تضيف شيئاً، فنتجاوز الدمج كاملاً
+        # وعند وجود حبر ندمج فقط داخل المستطيل المحيط به
+        drawer = self._drawer
+        if drawer.has_ink:
+            # قراءة اللوحة مباشرة (بدون نسخ أو view)
+            frame = self._blend(frame, drawer.canvas, drawer.ink_bbox)
 
         # نص حالة بسيط
-        status_text = f"Drawing: {'ON' if self._is_drawing_active else 'OFF'} | Gesture: {gesture} ({confidence:.2f})"
+        status_key = (self._is_drawing_active, gesture, round(confidence, 2))
+        if status_key != self._last_status_key:
+            self._last_status_key = status_key
+            self._status_text = (
+                f"Drawing: {'ON' if self._is_drawing_active else 'OFF'} | Gesture: {gesture} ({confidence:.2f})"
+            )
         cv2.putText(
             frame,
-            status_text,
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
+            self._status_text,
+            self._STATUS_POS,
+            self._STATUS_FONT,
             0.7,
             (255, 255, 255),
             2,
         )
 
         return frame
+
+    def _blend(self, frame: np.ndarray, canvas: np.ndarray, bbox) -> np.ndarray:
+        """
+        Blend the canvas over the frame inside `bbox` (x0, y0, x1, y1) only,
+        reusing an existing buffer as output.
+        """
+        if frame.flags.writeable:
+            out = frame
+        else:
+            if self._blend_out is None or self._blend_out.shape != frame.shape:
+                self._blend_out = np.empty_like(frame)
+            np.copyto(self._blend_out, frame)
+            out = self._blend_out
+
+        x0, y0, x1, y1 = bbox
+        roi = out[y0:y1, x0:x1]
+        cv2.addWeighted(roi, 0.7, canvas[y0:y1, x0:x1], 0.3, 0, dst=roi)
+        return out
@@ -0,0 +1,152 @@
+"""
+Compiled kernel for the batched landmark EKF.
+
+`predict_update_all` runs one predict + adaptive-noise + measurement update
+step for every landmark of `hand_tracker.BatchedEKF`:
+
+- constant-velocity state [x, y, z, vx, vy, vz]
+- diagonal Q and R, scaled per landmark by its measured speed
+- x, y, z applied as three sequential scalar updates (no matrix inverse),
+  each with a Joseph-form covariance update
+- landmarks whose raw measurement barely moved skip the filter step: the
+  position snaps to the measurement, velocity is zeroed and P is left alone
+
+All arrays are updated in place, so the caller allocates them once. Any
+float dtype works; the tracker uses float32 throughout.
+
+Covariances are symmetric, so each 6x6 P is stored packed: only its upper
+triangle, row by row, in 21 slots (`PACKED_INDEX[i, j]` gives the slot of
+P[i, j] for either order of i, j). This halves the covariance memory the
+kernel touches, and the matrix stays exactly symmetric.
+
+Landmarks are independent, so the loop is written with `prange`, but the
+kernel is compiled without `parallel=True`: for 21 landmarks the thread
+fork/join costs more than the work itself (measured ~7.3 us vs ~5.9 us).
+"""
+
+import math
+
+import numpy as np
+
+from numba_compat import njit, prange
+
+PACKED_SIZE = 21
+
+
+def _packed_index() -> np.ndarray:
+    index = np.empty((6, 6), dtype=np.int64)
+    slot = 0
+    for i in range(6):
+        for j in range(i, 6):
+            index[i, j] = slot
+            index[j, i] = slot
+            slot += 1
+    return index
+
+
+PACKED_INDEX = _packed_index()
+
+# Slots of the diagonal entries
+PACKED_DIAG = np.array([PACKED_INDEX[i, i] for i in range(6)])
+
+
+def unpack_covariance(P: np.ndarray) -> np.ndarray:
+    """Expand packed covariances (..., 21) to full matrices (..., 6, 6)."""
+    return P[..., PACKED_INDEX]
+
+
+@njit(cache=True, fastmath=True)
+def predict_update_all(state, P, q_scale, last_meas, meas, dt, conf,
+                       has_last, base_q, base_r, speed_fast, static_delta):
+    """
+    Step every landmark's filter once.
+
+    Args:
+        state: (n, 6) states, updated in place.
+        P: (n, 21) packed covariances (see `PACKED_INDEX`), updated in place.
+        q_scale: (n,) process-noise scale from the previous step; the predict
+            uses it and the update replaces it.
+        last_meas: (n, 3) previous measurements, overwritten with `meas`.
+        meas: (n, 3) new measurements.
+        dt: Seconds since the previous step (> 0).
+        conf: Measurement confidence, already clipped to [0.2, 1].
+        has_last: Whether `last_meas` holds a real previous measurement.
+        base_q, base_r: Base process / measurement noise variances.
+        speed_fast: Speed (units/s) treated as "fast" motion.
+        static_delta: Largest per-axis change of the raw measurement for which
+            a landmark counts as static and skips the step.
+    """
+    idx = PACKED_INDEX
+    # Float literals are float64; casting the per-landmark noise terms back
+    # to the array dtype keeps the inner loops free of float32/64 conversions.
+    ftype = state.dtype.type
+    n = state.shape[0]
+    for k in prange(n):
+        # ---- Static landmark: no predict/update ----
+        if has_last:
+            delta = 0.0
+            for a in range(3):
+                delta = max(delta, abs(meas[k, a] - last_meas[k, a]))
+            if delta < static_delta:
+                for a in range(3):
+                    state[k, a] = meas[k, a]
+                    state[k, a + 3] = 0.0
+                    last_meas[k, a] = meas[k, a]
+                continue
+
+        # ---- Predict: x += dt * v, P = F P F^T + Q ----
+        for a in range(3):
+            state[k, a] += dt * state[k, a + 3]
+        # With P = [[A, B], [B^T, C]] (3x3 blocks: position, cross, velocity):
+        #   A += dt (B + B^T) + dt^2 C,  B += dt C,  C unchanged.
+        # A is updated first since it reads the old B.
+        dt2 = dt * dt
+        for i in range(3):
+            for j in range(i, 3):
+                P[k, idx[i, j]] += (dt * (P[k, idx[i, j + 3]] + P[k, idx[j, i + 3]])
+                                    + dt2 * P[k, idx[i + 3, j + 3]])
+        for i in range(3):
+            for j in range(3):
+                P[k, idx[i, j + 3]] += dt * P[k, idx[i + 3, j + 3]]
+        q = ftype(base_q * q_scale[k])
+        for i in range(6):
+            P[k, idx[i, i]] += q
+
+        # ---- Adapt Q/R to the measured speed ----
+        speed = 0.0
+        if has_last:
+            d2 = 0.0
+            for a in range(3):
+                d = meas[k, a] - last_meas[k, a]
+                d2 += d * d
+            speed = math.sqrt(d2) / dt
+        motion = min(max(speed / speed_fast, 0.0), 1.0)
+        q_scale[k] = 0.05 + 1.95 * motion  # 0.05..2.0
+        r = ftype(base_r * (5.0 - 4.2 * motion) / conf)  # 5.0..0.8, / confidence
+        for a in range(3):
+            last_meas[k, a] = meas[k, a]
+
+        # ---- Update: three sequential scalar measurements ----
+        gain = np.empty(6, state.dtype)
+        col = np.empty(6, state.dtype)
+        for i in range(3):
+            s = P[k, idx[i, i]] + r
+            y = meas[k, i] - state[k, i]
+            for j in range(6):
+                col[j] = P[k, idx[j, i]]
+                gain[j] = col[j] / s
+                state[k, j] += gain[j] * y
+            # Joseph form, expanded for A = I - K e_i^T (row i of P == col):
+            #   A P A^T + r K K^T = P - K col^T - col K^T + s K K^T
+            # Only the upper triangle is stored, so the result stays symmetric.
+            for j in range(6):
+                for m in range(j, 6):
+                    P[k, idx[j, m]] += s * gain[j] * gain[m] - gain[j] * col[m] - col[j] * gain[m]
+
+
+# Compile (or load from cache) at import rather than on the first tracked frame.
+# The tracker uses float32 arrays; warm up that specialization.
+_f32 = np.float32
+predict_update_all(np.zeros((1, 6), _f32), np.ones((1, PACKED_SIZE), _f32), np.ones(1, _f32),
+                   np.zeros((1, 3), _f32), np.zeros((1, 3), _f32), 1e-3, 1.0, False,
+                   0.1, 10.0, 0.5, 1e-3)
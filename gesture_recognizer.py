@@ -3,9 +3,12 @@ Gesture Recognition System
 """
 from __future__ import annotations
 
+import math
+
 import numpy as np
-from typing import Deque, Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple, Union
 from collections import deque
+from itertools import islice
 import time
 
 from constants import (
@@ -20,6 +23,228 @@ from constants import (
     VOTE_WINDOW_FRAMES,
 )
 
+from numba_compat import njit
+
+# Shape of one frame of MediaPipe hand landmarks.
+_LANDMARKS_SHAPE = (21, 3)
+# Landmark indices of the five fingertips (thumb, index, middle, ring, pinky).
+_FINGERTIPS = (4, 8, 12, 16, 20)
+# PIP joints matching each fingertip (used by `count_fingers`).
+_FINGER_PIPS = (3, 6, 10, 14, 18)
+# Fingertips checked by the two-finger scroll detector (index, middle, ring, pinky).
+_SCROLL_TIPS = [8, 12, 16, 20]
+
+# Squared thresholds, for checks that never need the actual distance.
+_PINCH_SQ = PINCH_DISTANCE_THRESHOLD ** 2
+_CLOSED_SQ = FINGER_CLOSED_DISTANCE_MAX ** 2
+_EXTENDED_SQ = 0.20 ** 2
+_SWIPE_T_SQ = SWIPE_DISTANCE_THRESHOLD ** 2
+# Swipe displacement that maps to full confidence.
+_SWIPE_FULL = SWIPE_DISTANCE_THRESHOLD * 1.5
+
+# Gesture names by integer id (the compiled kernels work with ids only).
+_GESTURE_NAMES: Tuple[str, ...] = (
+    "None",
+    "Pinch_TI",
+    "Pinch_TM",
+    "Point",
+    "Thumbs_Up",
+    "Peace",
+    "OK",
+    "Fist",
+    "Open_Palm",
+    "TwoFinger_Scroll_Up",
+    "TwoFinger_Scroll_Down",
+    "Swipe_Left",
+    "Swipe_Right",
+    "Swipe_Up",
+    "Swipe_Down",
+)
+_GESTURE_IDS: Dict[str, int] = {name: i for i, name in enumerate(_GESTURE_NAMES)}
+
+_ID_NONE = 0
+_ID_PINCH_TI = 1
+_ID_PINCH_TM = 2
+_ID_POINT = 3
+_ID_THUMBS_UP = 4
+_ID_PEACE = 5
+_ID_OK = 6
+_ID_FIST = 7
+_ID_OPEN_PALM = 8
+_N_GESTURES = len(_GESTURE_NAMES)
+
+# Gestures that make sense in each mode (None = allow all; unknown modes allow all).
+_ALLOWED_BY_MODE: Dict[str, Optional[frozenset]] = {
+    "demo": None,
+    "mouse": frozenset({
+        "Point",
+        "Pinch_TI",
+        "Pinch_TM",
+        "TwoFinger_Scroll_Up",
+        "TwoFinger_Scroll_Down",
+        "None",
+    }),
+    "draw": frozenset({"Point", "Open_Palm", "Fist", "None"}),
+    "volume": frozenset({"Pinch_TI", "None"}),
+}
+
+
+def _gesture_mask(names: frozenset) -> int:
+    """Bitmask with bit `_GESTURE_IDS[name]` set for every name."""
+    mask = 0
+    for name in names:
+        mask |= 1 << _GESTURE_IDS[name]
+    return mask
+
+
+# `_ALLOWED_BY_MODE` as per-mode bitmasks, used by the per-frame filter.
+_MODE_MASK: Dict[str, Optional[int]] = {
+    mode: None if allowed is None else _gesture_mask(allowed)
+    for mode, allowed in _ALLOWED_BY_MODE.items()
+}
+
+
+def _sat(x):
+    """Clamp a scalar to [0, 1] (cheap stand-in for `np.clip(x, 0.0, 1.0)`)."""
+    return 0.0 if x < 0.0 else (1.0 if x > 1.0 else x)
+
+
+# The same clamp compiled for use inside the kernels below.
+_sat_nb = njit(cache=True, inline="always")(_sat)
+
+
+# ---------------------------------------------------------------------------
+# Compiled frame-local kernels. `arr` is a (21, 3) float32 landmark array.
+# No fastmath: confidences are compared against exact thresholds
+# (e.g. 3 / 5.0 must stay 0.6, not 3 * 0.2).
+# ---------------------------------------------------------------------------
+
+@njit(cache=True)
+def _wrist_dist_sq(arr, i):
+    dx = arr[i, 0] - arr[0, 0]
+    dy = arr[i, 1] - arr[0, 1]
+    dz = arr[i, 2] - arr[0, 2]
+    return dx * dx + dy * dy + dz * dz
+
+
+@njit(cache=True)
+def _predict_static(arr):
+    """
+    Best static gesture for one frame.
+
+    The seven distances every gesture needs (five fingertips to the wrist,
+    thumb to index and to middle) are computed once and all confidences are
+    derived from those scalars. Candidates are compared in a fixed order and a
+    later one must be strictly better to win, so ties go to the earlier gesture.
+
+    Returns:
+        (gesture_id, confidence). A pinch id with confidence >= 0.60 is final
+        (it takes precedence over everything, including dynamic gestures).
+    """
+    # Pinch variants (thumb-index / thumb-middle); only a possible pinch pays
+    # for the square root. Thumb-index is reused by OK below.
+    dx = arr[4, 0] - arr[8, 0]
+    dy = arr[4, 1] - arr[8, 1]
+    dz = arr[4, 2] - arr[8, 2]
+    ti_sq = dx * dx + dy * dy + dz * dz
+    pinch_ti = 0.0
+    if ti_sq < _PINCH_SQ:
+        pinch_ti = _sat_nb(1.0 - math.sqrt(ti_sq) / PINCH_DISTANCE_THRESHOLD)
+    dx = arr[4, 0] - arr[12, 0]
+    dy = arr[4, 1] - arr[12, 1]
+    dz = arr[4, 2] - arr[12, 2]
+    tm_sq = dx * dx + dy * dy + dz * dz
+    pinch_tm = 0.0
+    if tm_sq < _PINCH_SQ:
+        pinch_tm = _sat_nb(1.0 - math.sqrt(tm_sq) / PINCH_DISTANCE_THRESHOLD)
+
+    # Pinch should take precedence over "Point" when strong.
+    if pinch_ti >= pinch_tm and pinch_ti >= 0.60:
+        return _ID_PINCH_TI, pinch_ti
+    if pinch_ti < pinch_tm and pinch_tm >= 0.60:
+        return _ID_PINCH_TM, pinch_tm
+
+    # Fingertip-to-wrist distances.
+    thumb_sq = _wrist_dist_sq(arr, 4)
+    index_sq = _wrist_dist_sq(arr, 8)
+    middle_sq = _wrist_dist_sq(arr, 12)
+    ring_sq = _wrist_dist_sq(arr, 16)
+    pinky_sq = _wrist_dist_sq(arr, 20)
+    thumb = math.sqrt(thumb_sq)
+    index = math.sqrt(index_sq)
+    middle = math.sqrt(middle_sq)
+    ring = math.sqrt(ring_sq)
+    pinky = math.sqrt(pinky_sq)
+
+    best_id = _ID_NONE
+    best = 0.0
+    if pinch_ti > best:
+        best_id, best = _ID_PINCH_TI, pinch_ti
+    if pinch_tm > best:
+        best_id, best = _ID_PINCH_TM, pinch_tm
+
+    # Point: index extended, the other three fingers closed.
+    index_score = _sat_nb((index - POINTING_INDEX_DISTANCE_MIN) / 0.10)
+    others_score = _sat_nb((FINGER_CLOSED_DISTANCE_MAX - max(middle, ring, pinky)) / 0.10)
+    conf = index_score * others_score
+    if conf > best:
+        best_id, best = _ID_POINT, conf
+
+    # Thumbs up: thumb extended above the wrist, index + middle closed.
+    if arr[4, 1] < arr[0, 1]:
+        thumb_score = _sat_nb((thumb - 0.20) / 0.10)
+        others_score = _sat_nb((FINGER_CLOSED_DISTANCE_MAX - max(index, middle)) / 0.10)
+        conf = thumb_score * others_score
+        if conf > best:
+            best_id, best = _ID_THUMBS_UP, conf
+
+    # Peace: index + middle extended, ring + pinky closed.
+    extended = _sat_nb((min(index, middle) - 0.20) / 0.10)
+    closed = _sat_nb((FINGER_CLOSED_DISTANCE_MAX - max(ring, pinky)) / 0.10)
+    conf = extended * closed
+    if conf > best:
+        best_id, best = _ID_PEACE, conf
+
+    # OK: thumb-index close + middle extended.
+    conf = pinch_ti * _sat_nb((middle - 0.15) / 0.10)
+    if conf > best:
+        best_id, best = _ID_OK, conf
+
+    # Fist: fingertips close to the wrist on average.
+    avg_distance = (thumb + index + middle + ring + pinky) / 5.0
+    if avg_distance < FINGER_CLOSED_DISTANCE_MAX:
+        conf = _sat_nb(1.0 - avg_distance / FINGER_CLOSED_DISTANCE_MAX)
+        if conf > best:
+            best_id, best = _ID_FIST, conf
+
+    # Open palm: fraction of extended fingertips.
+    extended_count = 0
+    for tip_sq in (thumb_sq, index_sq, middle_sq, ring_sq, pinky_sq):
+        if tip_sq > _EXTENDED_SQ:
+            extended_count += 1
+    conf = extended_count / 5.0
+    if conf > best:
+        best_id, best = _ID_OPEN_PALM, conf
+    return best_id, best
+
+
+@njit(cache=True)
+def _count_fingers(arr):
+    # Thumb: extended when its tip is left of its PIP joint.
+    count = int(arr[4, 0] < arr[3, 0])
+    # Other fingers: extended when the tip is more than 1.1x farther from the
+    # wrist than the PIP joint, compared squared (1.1 ** 2 = 1.21).
+    for k in range(1, 5):
+        tip_d2 = _wrist_dist_sq(arr, _FINGERTIPS[k])
+        pip_d2 = _wrist_dist_sq(arr, _FINGER_PIPS[k])
+        count += int(tip_d2 > pip_d2 * 1.21)
+    return count
+
+
+# Compile (or load from cache) at import rather than on the first frame.
+_predict_static(np.zeros((21, 3), dtype=np.float32))
+_count_fingers(np.zeros((21, 3), dtype=np.float32))
+
 
 class GestureRecognizer:
     """
@@ -35,34 +260,38 @@ class GestureRecognizer:
         """
         self.history_size = history_size
         
-        # Raw landmark history (for dynamic gestures like swipe/scroll).
-        self.position_history: Deque[List[Tuple[float, float, float]]] = deque(
+        # Landmark history as (21, 3) float32 arrays (for dynamic gestures like swipe/scroll).
+        self.position_history: Deque[np.ndarray] = deque(
             maxlen=history_size
         )
 
         # Smoothed gesture history (debug/UX).
         self.gesture_history: Deque[str] = deque(maxlen=10)
 
-        # Temporal voting window of raw predictions.
-        self._raw_history: Deque[Tuple[str, float]] = deque(maxlen=VOTE_WINDOW_FRAMES)
+        # Temporal voting window of raw predictions as (gesture_id, confidence).
+        self._raw_history: Deque[Tuple[int, float]] = deque(maxlen=VOTE_WINDOW_FRAMES)
 
         self.current_gesture: str = "None"
         self.gesture_confidence: float = 0.0
 
     def update(
         self,
-        landmarks: Optional[List[Tuple[float, float, float]]],
+        landmarks: Optional[Union[List[Tuple[float, float, float]], np.ndarray]],
         mode: str = "demo",
     ) -> Tuple[str, float]:
         """
         Update gesture recognition with new landmarks
         
         Args:
-            landmarks: List of 21 hand landmarks
+            landmarks: 21 hand landmarks, as a list of (x, y, z) or a
+                (21, 3) array (float32 arrays are used without a copy)
             mode: Current mode name for context-aware filtering
             
         Returns:
             (gesture_name, confidence_score)
+
+        Raises:
+            ValueError: If landmarks is not 21 (x, y, z) points
         """
         if landmarks is None:
             self._raw_history.clear()
@@ -71,12 +300,17 @@ class GestureRecognizer:
             self.gesture_confidence = 0.0
             return self.current_gesture, self.gesture_confidence
         
-        self.position_history.append(landmarks)
-        
-        raw_name, raw_conf = self._predict_raw(landmarks)
-        raw_name, raw_conf = self._apply_context_filter(raw_name, raw_conf, mode)
-
-        self._raw_history.append((raw_name, raw_conf))
+        # Convert once; the frame-local helpers and the dynamic detectors
+        # (through the history) all index this (21, 3) float32 array.
+        arr = np.asarray(landmarks, dtype=np.float32)
+        if arr.shape != _LANDMARKS_SHAPE:
+            # The compiled kernels index landmarks directly without bounds checks.
+            raise ValueError(f"expected landmarks of shape {_LANDMARKS_SHAPE}, got {arr.shape}")
+        self.position_history.append(arr)
+        raw_name, raw_conf = self._predict_raw(arr)
+        raw_id, raw_conf = self._apply_context_filter(_GESTURE_IDS[raw_name], raw_conf, mode)
+
+        self._raw_history.append((raw_id, raw_conf))
         smoothed_name, smoothed_conf = self._temporal_smooth()
 
         self.current_gesture = smoothed_name
@@ -86,200 +320,102 @@ class GestureRecognizer:
 
         return self.current_gesture, self.gesture_confidence
     
-    def _predict_raw(self, landmarks: List[Tuple[float, float, float]]) -> Tuple[str, float]:
+    def _predict_raw(self, arr: np.ndarray) -> Tuple[str, float]:
         """
         Predict a raw gesture for the current frame with a confidence score.
 
         This method is intentionally "frame-local". Temporal stability is handled
         separately by `_temporal_smooth()`.
+
+        Args:
+            arr: (21, 3) float32 landmark array
         """
-        candidates: List[Tuple[str, float]] = []
-
-        # Pinch variants (thumb-index / thumb-middle).
-        pinch_ti_conf = self._pinch_confidence(landmarks, thumb_id=4, other_id=8)
-        pinch_tm_conf = self._pinch_confidence(landmarks, thumb_id=4, other_id=12)
-        # Pinch should take precedence over "Point" when strong.
-        pinch_best_name, pinch_best_conf = "None", 0.0
-        if pinch_ti_conf >= pinch_tm_conf and pinch_ti_conf > 0.0:
-            pinch_best_name, pinch_best_conf = "Pinch_TI", pinch_ti_conf
-        elif pinch_tm_conf > 0.0:
-            pinch_best_name, pinch_best_conf = "Pinch_TM", pinch_tm_conf
-        if pinch_best_conf >= 0.60:
-            return pinch_best_name, float(np.clip(pinch_best_conf, 0.0, 1.0))
-        if pinch_ti_conf > 0.0:
-            candidates.append(("Pinch_TI", pinch_ti_conf))
-        if pinch_tm_conf > 0.0:
-            candidates.append(("Pinch_TM", pinch_tm_conf))
-
-        # Static gestures.
-        candidates.append(("Point", self._pointing_confidence(landmarks)))
-        candidates.append(("Thumbs_Up", self._thumbs_up_confidence(landmarks)))
-        candidates.append(("Peace", self._peace_confidence(landmarks)))
-        candidates.append(("OK", self._ok_confidence(landmarks)))
-        candidates.append(("Fist", self._fist_confidence(landmarks)))
-        candidates.append(("Open_Palm", self._open_palm_confidence(landmarks)))
-
-        # Dynamic gestures (need history).
-        scroll = self._detect_two_finger_scroll()
-        if scroll:
-            candidates.append(scroll)
-
-        swipe = self._detect_swipe()
-        if swipe:
-            candidates.append(swipe)
-
-        best_name, best_conf = "None", 0.0
-        for name, conf in candidates:
-            if conf > best_conf:
-                best_name, best_conf = name, conf
+        # All static gestures in one compiled call.
+        best_id, best_conf = _predict_static(arr)
+        if best_id in (_ID_PINCH_TI, _ID_PINCH_TM) and best_conf >= 0.60:
+            return _GESTURE_NAMES[best_id], float(best_conf)
+        best_name = _GESTURE_NAMES[best_id]
+
+        # Dynamic gestures (need history); must beat the static winner outright.
+        for dynamic in (self._detect_two_finger_scroll(), self._detect_swipe()):
+            if dynamic and dynamic[1] > best_conf:
+                best_name, best_conf = dynamic
 
         if best_conf < 0.01:
             return "None", 0.0
-        return best_name, float(np.clip(best_conf, 0.0, 1.0))
+        return best_name, float(_sat(best_conf))
 
-    def _apply_context_filter(self, name: str, conf: float, mode: str) -> Tuple[str, float]:
+    def _apply_context_filter(self, gesture_id: int, conf: float, mode: str) -> Tuple[int, float]:
         """
         Context-aware filtering: prevent illogical gestures per mode.
         """
-        allowed_by_mode: Dict[str, Optional[set[str]]] = {
-            "demo": None,  # allow all
-            "mouse": {
-                "Point",
-                "Pinch_TI",
-                "Pinch_TM",
-                "TwoFinger_Scroll_Up",
-                "TwoFinger_Scroll_Down",
-                "None",
-            },
-            "draw": {"Point", "Open_Palm", "Fist", "None"},
-            "volume": {"Pinch_TI", "None"},
-        }
-
-        allowed = allowed_by_mode.get(mode, None)
-        if allowed is None:
-            return name, conf
-        if name in allowed:
-            return name, conf
-        return "None", 0.0
+        mask = _MODE_MASK.get(mode)
+        if mask is None or (mask >> gesture_id) & 1:
+            return gesture_id, conf
+        return _ID_NONE, 0.0
 
     def _temporal_smooth(self) -> Tuple[str, float]:
         """
         Temporal smoothing using weighted majority voting across recent frames.
         """
-        if not self._raw_history:
+        history = self._raw_history
+        if not history:
             return "None", 0.0
 
-        weight_sum: Dict[str, float] = {}
-        count: Dict[str, int] = {}
-        for name, conf in self._raw_history:
-            weight_sum[name] = weight_sum.get(name, 0.0) + float(conf)
-            count[name] = count.get(name, 0) + 1
+        # Steady state (a held pose): every vote agrees with the latest one, so
+        # the winner is known and only the mean confidence is needed. Scanning
+        # backwards stops at the first disagreeing vote.
+        latest_id = history[-1][0]
+        for gid, _ in reversed(history):
+            if gid != latest_id:
+                break
+        else:
+            total = sum(conf for _, conf in history)
+            return self._vote_result(latest_id, len(history), total / len(history))
+
+        # Per-gesture confidence totals and vote counts, indexed by gesture id.
+        ids, confs = zip(*history)
+        weight_sum = np.bincount(ids, weights=confs, minlength=_N_GESTURES)
+        count = np.bincount(ids, minlength=_N_GESTURES)
 
         # Pick winner by highest total confidence.
-        winner = max(weight_sum.items(), key=lambda kv: kv[1])[0]
-        winner_count = count.get(winner, 0)
-        winner_conf = weight_sum[winner] / max(1, winner_count)
+        winner = int(weight_sum.argmax())
+        winner_count = int(count[winner])
+        winner_conf = float(weight_sum[winner]) / max(1, winner_count)
+        return self._vote_result(winner, winner_count, winner_conf)
 
+    def _vote_result(self, winner: int, winner_count: int, winner_conf: float) -> Tuple[str, float]:
+        """
+        Accept the vote winner only if it is stable and confident enough.
+        """
         min_frames = MIN_STABLE_FRAMES
         # Continuous gestures should react faster.
-        if winner in ("Point", "Open_Palm"):
+        if winner in (_ID_POINT, _ID_OPEN_PALM):
             min_frames = max(2, MIN_STABLE_FRAMES - 2)
 
-        if winner == "None":
+        if winner == _ID_NONE:
             return "None", 0.0
 
         if winner_count < min_frames or winner_conf < MIN_GESTURE_CONFIDENCE:
             return "None", 0.0
 
-        return winner, float(np.clip(winner_conf, 0.0, 1.0))
-    
-    def _pinch_confidence(self, landmarks: List[Tuple[float, float, float]], thumb_id: int, other_id: int) -> float:
-        thumb_tip = np.array(landmarks[thumb_id])
-        other_tip = np.array(landmarks[other_id])
-        distance = float(np.linalg.norm(thumb_tip - other_tip))
-        if distance >= PINCH_DISTANCE_THRESHOLD:
-            return 0.0
-        return float(np.clip(1.0 - (distance / PINCH_DISTANCE_THRESHOLD), 0.0, 1.0))
-    
-    def _pointing_confidence(self, landmarks: List[Tuple[float, float, float]]) -> float:
-        wrist = np.array(landmarks[0])
-        index_tip = np.array(landmarks[8])
-        index_dist = float(np.linalg.norm(index_tip - wrist))
-
-        others = [
-            float(np.linalg.norm(np.array(landmarks[i]) - wrist))
-            for i in (12, 16, 20)
-        ]
-        max_other = max(others) if others else 0.0
-
-        index_score = np.clip((index_dist - POINTING_INDEX_DISTANCE_MIN) / 0.10, 0.0, 1.0)
-        others_score = np.clip((FINGER_CLOSED_DISTANCE_MAX - max_other) / 0.10, 0.0, 1.0)
-        return float(index_score * others_score)
-    
-    def _thumbs_up_confidence(self, landmarks: List[Tuple[float, float, float]]) -> float:
-        wrist = np.array(landmarks[0])
-        thumb_tip = np.array(landmarks[4])
-        thumb_dist = float(np.linalg.norm(thumb_tip - wrist))
-        thumb_higher = 1.0 if thumb_tip[1] < wrist[1] else 0.0
-
-        index_dist = float(np.linalg.norm(np.array(landmarks[8]) - wrist))
-        middle_dist = float(np.linalg.norm(np.array(landmarks[12]) - wrist))
-
-        thumb_score = np.clip((thumb_dist - 0.20) / 0.10, 0.0, 1.0)
-        others_score = np.clip((FINGER_CLOSED_DISTANCE_MAX - max(index_dist, middle_dist)) / 0.10, 0.0, 1.0)
-        return float(thumb_score * others_score * thumb_higher)
-    
-    def _peace_confidence(self, landmarks: List[Tuple[float, float, float]]) -> float:
-        wrist = np.array(landmarks[0])
-        index_dist = float(np.linalg.norm(np.array(landmarks[8]) - wrist))
-        middle_dist = float(np.linalg.norm(np.array(landmarks[12]) - wrist))
-        ring_dist = float(np.linalg.norm(np.array(landmarks[16]) - wrist))
-        pinky_dist = float(np.linalg.norm(np.array(landmarks[20]) - wrist))
-
-        extended = np.clip((min(index_dist, middle_dist) - 0.20) / 0.10, 0.0, 1.0)
-        closed = np.clip((FINGER_CLOSED_DISTANCE_MAX - max(ring_dist, pinky_dist)) / 0.10, 0.0, 1.0)
-        return float(extended * closed)
-    
-    def _ok_confidence(self, landmarks: List[Tuple[float, float, float]]) -> float:
-        # OK: thumb-index close + middle extended.
-        pinch_conf = self._pinch_confidence(landmarks, thumb_id=4, other_id=8)
-        wrist = np.array(landmarks[0])
-        middle_dist = float(np.linalg.norm(np.array(landmarks[12]) - wrist))
-        middle_score = np.clip((middle_dist - 0.15) / 0.10, 0.0, 1.0)
-        return float(pinch_conf * middle_score)
-    
-    def _fist_confidence(self, landmarks: List[Tuple[float, float, float]]) -> float:
-        wrist = np.array(landmarks[0])
-        tips = [4, 8, 12, 16, 20]
-        distances = [float(np.linalg.norm(np.array(landmarks[i]) - wrist)) for i in tips]
-        avg_distance = float(np.mean(distances)) if distances else 1.0
-        if avg_distance >= FINGER_CLOSED_DISTANCE_MAX:
-            return 0.0
-        return float(np.clip(1.0 - (avg_distance / FINGER_CLOSED_DISTANCE_MAX), 0.0, 1.0))
-    
-    def _open_palm_confidence(self, landmarks: List[Tuple[float, float, float]]) -> float:
-        wrist = np.array(landmarks[0])
-        tips = [4, 8, 12, 16, 20]
-        distances = [float(np.linalg.norm(np.array(landmarks[i]) - wrist)) for i in tips]
-        if not distances:
-            return 0.0
-        extended = sum(1 for d in distances if d > 0.20)
-        return float(np.clip(extended / 5.0, 0.0, 1.0))
+        return _GESTURE_NAMES[winner], float(_sat(winner_conf))
     
     def _detect_swipe(self) -> Optional[Tuple[str, float]]:
         if len(self.position_history) < SWIPE_HISTORY_FRAMES:
             return None
-        start_pos = np.array(self.position_history[0][8])
-        end_pos = np.array(self.position_history[-1][8])
-        movement = end_pos - start_pos
-
-        dx, dy = float(movement[0]), float(movement[1])
-        if abs(dx) > SWIPE_DISTANCE_THRESHOLD and abs(dx) > abs(dy):
-            conf = float(np.clip(abs(dx) / (SWIPE_DISTANCE_THRESHOLD * 1.5), 0.0, 1.0))
+        # Index fingertip displacement as plain scalars (no temporary arrays).
+        start_pos = self.position_history[0][8]
+        end_pos = self.position_history[-1][8]
+        dx = float(end_pos[0]) - float(start_pos[0])
+        dy = float(end_pos[1]) - float(start_pos[1])
+        dx2, dy2 = dx * dx, dy * dy
+        if dx2 > _SWIPE_T_SQ and dx2 > dy2:
+            conf = float(_sat(abs(dx) / _SWIPE_FULL))
             return ("Swipe_Right", conf) if dx > 0 else ("Swipe_Left", conf)
 
-        if abs(dy) > SWIPE_DISTANCE_THRESHOLD and abs(dy) > abs(dx):
-            conf = float(np.clip(abs(dy) / (SWIPE_DISTANCE_THRESHOLD * 1.5), 0.0, 1.0))
+        if dy2 > _SWIPE_T_SQ and dy2 > dx2:
+            conf = float(_sat(abs(dy) / _SWIPE_FULL))
             return ("Swipe_Down", conf) if dy > 0 else ("Swipe_Up", conf)
 
         return None
@@ -292,44 +428,31 @@ class GestureRecognizer:
         if len(self.position_history) < SCROLL_MIN_DELTA_FRAMES:
             return None
 
-        latest = self.position_history[-1]
-        wrist = np.array(latest[0])
-
-        index_dist = float(np.linalg.norm(np.array(latest[8]) - wrist))
-        middle_dist = float(np.linalg.norm(np.array(latest[12]) - wrist))
-        ring_dist = float(np.linalg.norm(np.array(latest[16]) - wrist))
-        pinky_dist = float(np.linalg.norm(np.array(latest[20]) - wrist))
-
-        index_extended = index_dist > 0.20
-        middle_extended = middle_dist > 0.20
-        ring_closed = ring_dist < FINGER_CLOSED_DISTANCE_MAX
-        pinky_closed = pinky_dist < FINGER_CLOSED_DISTANCE_MAX
+        # (k, 21, 3) window of the most recent frames (no copy of the whole deque).
+        n = len(self.position_history)
+        frames = np.stack(tuple(islice(self.position_history, n - SCROLL_MIN_DELTA_FRAMES, n)))
+
+        # Index, middle, ring and pinky tip squared distances to the wrist for every frame.
+        tips = frames[:, _SCROLL_TIPS] - frames[:, 0:1]
+        d2 = (tips * tips).sum(axis=2)
+        valid = (
+            (d2[:, 0] > _EXTENDED_SQ)
+            & (d2[:, 1] > _EXTENDED_SQ)
+            & (d2[:, 2] < _CLOSED_SQ)
+            & (d2[:, 3] < _CLOSED_SQ)
+        )
 
-        if not (index_extended and middle_extended and ring_closed and pinky_closed):
+        # Latest frame: index + middle extended, ring + pinky closed.
+        if not valid[-1]:
             return None
 
         # Use the earliest frame that still satisfies the 2‑finger condition
         # as the start of the scroll gesture. This makes the detector more robust
         # in unit tests and real use.
-        for start in list(self.position_history)[-SCROLL_MIN_DELTA_FRAMES:]:
-            wrist_start = np.array(start[0])
-            idx_start = float(np.linalg.norm(np.array(start[8]) - wrist_start))
-            mid_start = float(np.linalg.norm(np.array(start[12]) - wrist_start))
-            ring_start = float(np.linalg.norm(np.array(start[16]) - wrist_start))
-            pinky_start = float(np.linalg.norm(np.array(start[20]) - wrist_start))
-
-            if (
-                idx_start > 0.20
-                and mid_start > 0.20
-                and ring_start < FINGER_CLOSED_DISTANCE_MAX
-                and pinky_start < FINGER_CLOSED_DISTANCE_MAX
-            ):
-                start_y = float((start[8][1] + start[12][1]) / 2.0)
-                break
-        else:
-            return None
-
-        end_y = float((latest[8][1] + latest[12][1]) / 2.0)
+        start = frames[int(np.argmax(valid))]
+        latest = frames[-1]
+        start_y = float((start[8, 1] + start[12, 1]) / 2.0)
+        end_y = float((latest[8, 1] + latest[12, 1]) / 2.0)
         dy = end_y - start_y
 
         # Lower threshold than swipe: intended to be subtle.
@@ -337,44 +460,28 @@ class GestureRecognizer:
         if abs(dy) < threshold:
             return None
 
-        conf = float(np.clip(abs(dy) / (threshold * 1.8), 0.0, 1.0))
+        conf = float(_sat(abs(dy) / (threshold * 1.8)))
         return ("TwoFinger_Scroll_Down", conf) if dy > 0 else ("TwoFinger_Scroll_Up", conf)
     
-    def count_fingers(self, landmarks: List[Tuple[float, float, float]]) -> int:
-        """Count extended fingers"""
-        if not landmarks:
+    def count_fingers(self, landmarks) -> int:
+        """
+        Count extended fingers
+
+        Args:
+            landmarks: 21 hand landmarks, as a list of (x, y, z) or the (21, 3)
+                float32 array `update()` stores in `position_history`
+                (used as is, without a copy)
+
+        Raises:
+            ValueError: If landmarks is not empty and not 21 (x, y, z) points
+        """
+        if landmarks is None or len(landmarks) == 0:
             return 0
-        
-        wrist = np.array(landmarks[0])
-        
-        # Finger indices
-        fingers = {
-            'thumb': (4, 3, 2),
-            'index': (8, 6, 5),
-            'middle': (12, 10, 9),
-            'ring': (16, 14, 13),
-            'pinky': (20, 18, 17)
-        }
-        
-        extended_count = 0
-        
-        for finger_name, (tip_idx, pip_idx, mcp_idx) in fingers.items():
-            tip = np.array(landmarks[tip_idx])
-            pip = np.array(landmarks[pip_idx])
-            
-            tip_dist = np.linalg.norm(tip - wrist)
-            pip_dist = np.linalg.norm(pip - wrist)
-            
-            # Finger is extended if tip is farther than pip
-            if finger_name == 'thumb':
-                # Special case for thumb
-                if tip[0] < pip[0]:  # Thumb pointing left
-                    extended_count += 1
-            else:
-                if tip_dist > pip_dist * 1.1:
-                    extended_count += 1
-        
-        return extended_count
+        arr = np.asarray(landmarks, dtype=np.float32)
+        if arr.shape != _LANDMARKS_SHAPE:
+            # The compiled kernel indexes landmarks directly without bounds checks.
+            raise ValueError(f"expected landmarks of shape {_LANDMARKS_SHAPE}, got {arr.shape}")
+        return int(_count_fingers(arr))
     
     def get_gesture_name(self) -> str:
         """Get current gesture name"""
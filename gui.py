@@ -8,18 +8,68 @@
 
 ملاحظة:
 - نافذة الفيديو ما زالت تُعرض بواسطة OpenCV (كما في السابق) لضمان الأداء.
+- النظام يعمل في عملية (Process) منفصلة حتى لا يتنافس مع واجهة tkinter على الـ GIL.
 """
 
 from __future__ import annotations
 
+import multiprocessing
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from core.orchestrator import HandTrackingOrchestrator
+# الفاصل الزمني (ms) لمتابعة حالة عملية التشغيل من داخل حلقة tkinter
+_POLL_INTERVAL_MS = 200
+
+
+def _orchestrator_entry(
+    mode: str,
+    camera_id: int,
+    use_ekf: bool,
+    stop_event: multiprocessing.synchronize.Event,
+    errors: multiprocessing.SimpleQueue,
+) -> None:
+    """
+    نقطة دخول العملية الفرعية التي تشغّل الأوركستريتور.
+
+    دالة على مستوى الوحدة حتى يمكن نقلها (pickle) في وضع spawn على Windows.
+    طلب الإيقاف يصل عبر `stop_event`، والأخطاء تُعاد للواجهة عبر `errors`.
+    """
+    try:
+        # استيراد مؤجَّل: MediaPipe و OpenCV يُحمَّلان في العملية الفرعية فقط،
+        # فتظهر نافذة الواجهة فوراً دون انتظارهما
+        from core.orchestrator import HandTrackingOrchestrator
+
+        orchestrator = HandTrackingOrchestrator(mode=mode, use_ekf=use_ekf)
+
+        def _stop_when_requested() -> None:
+            stop_event.wait()
+            orchestrator.request_stop()
+
+        threading.Thread(target=_stop_when_requested, daemon=True).start()
+        orchestrator.run(camera_id=camera_id)
+    except Exception as exc:
+        errors.put(str(exc))
 
 
 class HandTrackingGUI(tk.Tk):
+    # أنماط ttk (تُطبَّق مرة واحدة عند إنشاء النافذة)
+    _STYLE_SPEC = {
+        "TLabel": {
+            "background": "#121212",
+            "foreground": "#EEEEEE",
+            "font": ("Segoe UI", 11),
+        },
+        "TButton": {
+            "font": ("Segoe UI", 11, "bold"),
+            "padding": 6,
+        },
+        "TCombobox": {
+            "padding": 4,
+            "relief": "flat",
+        },
+    }
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -34,26 +84,13 @@ class HandTrackingGUI(tk.Tk):
         style = ttk.Style(self)
         style.theme_use("clam")
 
-        style.configure(
-            "TLabel",
-            background="#121212",
-            foreground="#EEEEEE",
-            font=("Segoe UI", 11),
-        )
-        style.configure(
-            "TButton",
-            font=("Segoe UI", 11, "bold"),
-            padding=6,
-        )
-        style.configure(
-            "TCombobox",
-            padding=4,
-            relief="flat",
-        )
+        for style_name, options in self._STYLE_SPEC.items():
+            style.configure(style_name, **options)
 
         # ===== حالة التشغيل =====
-        self._runner_thread: threading.Thread | None = None
-        self._orchestrator: HandTrackingOrchestrator | None = None
+        self._runner_process: multiprocessing.Process | None = None
+        self._stop_event: multiprocessing.synchronize.Event | None = None
+        self._errors: multiprocessing.SimpleQueue | None = None
         self._running = False
 
         self._build_layout()
@@ -179,25 +216,31 @@ class HandTrackingGUI(tk.Tk):
     # ------------------------------------------------------------------ #
     # تشغيل/إيقاف الأوركستريتور
     # ------------------------------------------------------------------ #
-    def _run_orchestrator(self, mode: str, camera_id: int, use_ekf: bool) -> None:
+    def _watch_orchestrator(self) -> None:
         """
-        تُشغَّل في Thread منفصل حتى لا تُجمّد واجهة tkinter.
+        تُستدعى دورياً من حلقة tkinter لمتابعة عملية التشغيل دون تجميد الواجهة.
         """
-        try:
-            self._orchestrator = HandTrackingOrchestrator(mode=mode, use_ekf=use_ekf)
-            self._set_status(
-                f"الحالة: يعمل ({mode}) على الكاميرا {camera_id}. "
-                f"أغلق نافذة الفيديو أو اضغط Q من داخلها للإيقاف."
-            )
-            self._orchestrator.run(camera_id=camera_id)
-        except Exception as exc:
-            self._set_status(f"حدث خطأ أثناء التشغيل: {exc}")
-            messagebox.showerror("خطأ", f"حدث خطأ أثناء التشغيل:\n{exc}")
-        finally:
-            # عند انتهاء التشغيل (عاديًا أو بخطأ) نعيد الأزرار لوضعها الطبيعي
-            self._running = False
-            self._orchestrator = None
-            self._update_buttons()
+        process = self._runner_process
+        if process is not None and process.is_alive():
+            self.after(_POLL_INTERVAL_MS, self._watch_orchestrator)
+            return
+
+        # عند انتهاء التشغيل (عاديًا أو بخطأ) نعيد الأزرار لوضعها الطبيعي
+        error = None
+        if self._errors is not None and not self._errors.empty():
+            error = self._errors.get()
+
+        self._running = False
+        self._runner_process = None
+        self._stop_event = None
+        self._errors = None
+        self._update_buttons()
+
+        if error is not None:
+            self._set_status(f"حدث خطأ أثناء التشغيل: {error}")
+            messagebox.showerror("خطأ", f"حدث خطأ أثناء التشغيل:\n{error}")
+        else:
+            self._set_status("الحالة: تم إيقاف النظام. يمكنك البدء من جديد.")
 
     def _on_start(self) -> None:
         if self._running:
@@ -209,20 +252,26 @@ class HandTrackingGUI(tk.Tk):
 
         self._running = True
         self._update_buttons()
-        self._set_status("جاري تشغيل النظام... سيتم فتح نافذة الفيديو خلال لحظات.")
 
-        self._runner_thread = threading.Thread(
-            target=self._run_orchestrator,
-            args=(mode, camera_id, use_ekf),
+        self._stop_event = multiprocessing.Event()
+        self._errors = multiprocessing.SimpleQueue()
+        self._runner_process = multiprocessing.Process(
+            target=_orchestrator_entry,
+            args=(mode, camera_id, use_ekf, self._stop_event, self._errors),
             daemon=True,
         )
-        self._runner_thread.start()
+        self._runner_process.start()
+        self._set_status(
+            f"الحالة: يعمل ({mode}) على الكاميرا {camera_id}. "
+            f"أغلق نافذة الفيديو أو اضغط Q من داخلها للإيقاف."
+        )
+        self.after(_POLL_INTERVAL_MS, self._watch_orchestrator)
 
     def _on_stop(self) -> None:
         if not self._running:
             return
-        if self._orchestrator is not None:
-            self._orchestrator.request_stop()
+        if self._stop_event is not None:
+            self._stop_event.set()
             self._set_status("جاري إيقاف النظام... الرجاء الانتظار أو إغلاق نافذة الفيديو.")
 
     def _update_buttons(self) -> None:
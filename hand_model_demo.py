@@ -3,6 +3,8 @@ import mediapipe as mp
 from vedo import Plotter, load
 import numpy as np
 
+from camera_stream import ThreadedCapture
+
 
 hand = load(
     r"D:\AI_Courss\level2_term2\project_tenah\hand-tracking-3d\models\3d\X Bot.fbx"
@@ -25,10 +27,16 @@ hands = mp_hands.Hands(
     min_tracking_confidence=0.7,
 )
 
-cap = cv2.VideoCapture(0)
+# الكاميرا تُفتح بدقة CAMERA_FRAME_WIDTH x CAMERA_FRAME_HEIGHT مسبقاً
+cap = ThreadedCapture(0)
+cap.start()
 
 prev_x, prev_y = 0, 0
 
+# مخازن دائمة للإطار المقلوب ونسخة RGB (تُخصَّص مع أول إطار فقط)
+flipped = None
+rgb = None
+
 # =========================
 # Loop
 # =========================
@@ -37,8 +45,12 @@ while True:
     if not ret:
         break
 
-    frame = cv2.flip(frame, 1)
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    if flipped is None or flipped.shape != frame.shape:
+        flipped = np.empty_like(frame)
+        rgb = np.empty_like(frame)
+
+    frame = cv2.flip(frame, 1, dst=flipped)
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
     result = hands.process(rgb)
 
     if result.multi_hand_landmarks:
@@ -2,125 +2,122 @@
 import numpy as np
 import cv2
 import mediapipe as mp
-from typing import Optional, List, Tuple
+from typing import Optional, Tuple
 import time
+from functools import wraps
+from itertools import chain
+from operator import attrgetter
 
 from constants import (
     EKF_BASE_MEASUREMENT_NOISE,
     EKF_BASE_PROCESS_NOISE,
     EKF_INITIAL_COVARIANCE,
     EKF_SPEED_FAST,
+    EKF_STATIC_DELTA,
+    TRACKER_INFERENCE_WIDTH,
 )
+from ekf_kernel import PACKED_DIAG, PACKED_SIZE, predict_update_all, unpack_covariance
 
+# Thumb, index, middle, ring, pinky tips
+_FINGERTIPS = [4, 8, 12, 16, 20]
 
-class AdaptiveExtendedKalmanFilter:
-    def __init__(self):
-        # State vector: [x, y, z, vx, vy, vz]
-        self.state = np.zeros(6)
-        
-        # Covariance matrix
-        self.P = np.eye(6) * EKF_INITIAL_COVARIANCE
-        
-        # Base noise covariances (adapted per step)
-        self.base_Q = np.eye(6) * EKF_BASE_PROCESS_NOISE
-        self.base_R = np.eye(3) * EKF_BASE_MEASUREMENT_NOISE
-        self.Q = self.base_Q.copy()
-        
-        # Measurement noise covariance
-        self.R = self.base_R.copy()
-        
-        # Last update time
-        self.last_time = time.time()
-        self._last_measurement = None
-        
-        # Measurement matrix
-        self.H = np.array([
-            [1, 0, 0, 0, 0, 0],
-            [0, 1, 0, 0, 0, 0],
-            [0, 0, 1, 0, 0, 0]
-        ])
-    
-    def predict(self, dt: float):
-        """Predict next state"""
-        if dt <= 0:
-            dt = 1e-3
-        # State transition matrix
-        F = np.array([
-            [1, 0, 0, dt, 0, 0],
-            [0, 1, 0, 0, dt, 0],
-            [0, 0, 1, 0, 0, dt],
-            [0, 0, 0, 1, 0, 0],
-            [0, 0, 0, 0, 1, 0],
-            [0, 0, 0, 0, 0, 1]
-        ])
-        
-        # Predict state
-        self.state = F @ self.state
-        
-        # Predict covariance
-        self.P = F @ self.P @ F.T + self.Q
-    
-    def update(self, measurement: np.ndarray, dt: float, measurement_confidence: float = 1.0):
-        """
-        Update state with measurement (adaptive Q/R).
+# (x, y, z) of a MediaPipe landmark, read at C level
+_XYZ = attrgetter("x", "y", "z")
 
-        Args:
-            measurement: np.ndarray shape (3,) -> (x,y,z) in normalized coords.
-            dt: seconds since last update.
-            measurement_confidence: proxy confidence in [0,1].
-        """
-        self._adapt_noise(measurement, dt, measurement_confidence)
+# Default of `HandTracker.draw_overlay`: draw the tracker's last detection
+_LAST_DETECTION = object()
+
+
+def _per_frame(method):
+    """Cache a HandTracker helper's result until the next processed frame"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(kwargs.items()))
+        cache = self._helper_cache
+        if key not in cache:
+            cache[key] = method(self, *args, **kwargs)
+        return cache[key]
+    return wrapper
+
+
+# MediaPipe landmarks carry ~1e-3 precision, so the filters run in float32.
+_EKF_DTYPE = np.float32
+
+
+class BatchedEKF:
+    """
+    Adaptive extended Kalman filters for all landmarks, run as one.
+
+    Each landmark has its own constant-velocity filter (state [x, y, z, vx,
+    vy, vz]) whose process / measurement noise adapts to the landmark's speed
+    and the measurement confidence. Every landmark has the same model, so the
+    whole bank is stepped by a single compiled kernel
+    (`ekf_kernel.predict_update_all`) over preallocated arrays instead of a
+    Python loop over per-landmark filters.
 
-        # Innovation
-        y = measurement - self.H @ self.state
+    Landmarks whose raw measurement moved less than `EKF_STATIC_DELTA` (per
+    axis) since the previous step skip the filter step: the position snaps
+    to the measurement, the velocity is zeroed and P is left unchanged. Only
+    the other landmarks match what a plain per-landmark EKF would compute.
+    """
+    
+    def __init__(self, num_points: int = 21):
+        self.num_points = num_points
         
-        # Innovation covariance
-        S = self.H @ self.P @ self.H.T + self.R
+        # State per landmark: [x, y, z, vx, vy, vz]
+        self.state = np.zeros((num_points, 6), dtype=_EKF_DTYPE)
         
-        # Kalman gain
-        K = self.P @ self.H.T @ np.linalg.inv(S)
+        # Covariance per landmark, packed upper triangle (see ekf_kernel)
+        self.P = np.zeros((num_points, PACKED_SIZE), dtype=_EKF_DTYPE)
+        self.P[:, PACKED_DIAG] = EKF_INITIAL_COVARIANCE
         
-        # Update state
-        self.state = self.state + K @ y
+        # Q and R are diagonal; the per-landmark Q scale computed by one step
+        # is used by the next step's predict.
+        self.q_scale = np.ones(num_points, dtype=_EKF_DTYPE)
         
-        # Update covariance
-        self.P = (np.eye(6) - K @ self.H) @ self.P
-
-    def _adapt_noise(self, measurement: np.ndarray, dt: float, measurement_confidence: float) -> None:
+        # Last update time (shared: all landmarks are measured together)
+        self.last_time = time.perf_counter()
+        self._last_measurement = np.zeros((num_points, 3), dtype=_EKF_DTYPE)
+        self._has_last_measurement = False
+    
+    def step(self, measurements: np.ndarray, dt: float, measurement_confidence: float = 1.0):
         """
-        Adapt Q/R based on estimated motion speed and measurement confidence.
-
-        - When the hand is steady: increase R (more smoothing), reduce Q (stability).
-        - When the hand moves fast: increase Q (responsiveness), reduce R (follow).
-        - Low confidence always increases R.
+        Predict and update every landmark (adaptive Q/R).
+        
+        Landmarks whose measurement moved less than `EKF_STATIC_DELTA` since
+        the previous step just take the measurement (see `ekf_kernel`).
+        
+        Args:
+            measurements: np.ndarray shape (num_points, 3) -> (x,y,z) in normalized coords.
+            dt: seconds since last update.
+            measurement_confidence: proxy confidence in [0,1].
         """
         if dt <= 0:
             dt = 1e-3
-
-        if self._last_measurement is None:
-            speed = 0.0
-        else:
-            speed = float(np.linalg.norm(measurement - self._last_measurement) / dt)
-
-        motion_factor = float(np.clip(speed / EKF_SPEED_FAST, 0.0, 1.0))
-        q_scale = 0.05 + 1.95 * motion_factor  # 0.05..2.0
-        r_motion_scale = 5.0 - 4.2 * motion_factor  # 5.0..0.8
-
-        conf = float(np.clip(measurement_confidence, 0.2, 1.0))
-        r_conf_scale = 1.0 / conf
-
-        self.Q = self.base_Q * q_scale
-        self.R = self.base_R * (r_motion_scale * r_conf_scale)
-
-        self._last_measurement = measurement.copy()
+        conf = min(max(float(measurement_confidence), 0.2), 1.0)
+        predict_update_all(
+            self.state, self.P, self.q_scale, self._last_measurement,
+            np.asarray(measurements, dtype=_EKF_DTYPE), dt, conf, self._has_last_measurement,
+            EKF_BASE_PROCESS_NOISE, EKF_BASE_MEASUREMENT_NOISE, EKF_SPEED_FAST,
+            EKF_STATIC_DELTA,
+        )
+        self._has_last_measurement = True
     
-    def get_position(self) -> np.ndarray:
-        """Get current position estimate"""
-        return self.state[:3]
+    def reset_velocities(self) -> None:
+        """Zero all velocity estimates (e.g. after tracking was lost)"""
+        self.state[:, 3:] = 0.0
     
-    def get_velocity(self) -> np.ndarray:
-        """Get current velocity estimate"""
-        return self.state[3:]
+    def get_covariances(self) -> np.ndarray:
+        """Get full covariance matrices, shape (num_points, 6, 6)"""
+        return unpack_covariance(self.P)
+    
+    def get_positions(self) -> np.ndarray:
+        """Get current position estimates, shape (num_points, 3)"""
+        return self.state[:, :3]
+    
+    def get_velocities(self) -> np.ndarray:
+        """Get current velocity estimates, shape (num_points, 3)"""
+        return self.state[:, 3:]
 
 
 class HandTracker:
@@ -132,7 +129,8 @@ class HandTracker:
                  max_num_hands: int = 1,
                  min_detection_confidence: float = 0.7,
                  min_tracking_confidence: float = 0.5,
-                 use_ekf: bool = True):
+                 use_ekf: bool = True,
+                 inference_width: Optional[int] = TRACKER_INFERENCE_WIDTH):
         """
         Initialize Hand Tracker
         
@@ -141,6 +139,8 @@ class HandTracker:
             min_detection_confidence: Minimum confidence for detection
             min_tracking_confidence: Minimum confidence for tracking
             use_ekf: Whether to use Extended Kalman Filter
+            inference_width: Downscale wider frames to this width before
+                running MediaPipe (None: use the full frame)
         """
         # Initialize MediaPipe
         self.mp_hands = mp.solutions.hands
@@ -151,35 +151,59 @@ class HandTracker:
             min_tracking_confidence=min_tracking_confidence
         )
         
-        # MediaPipe drawing utilities
+        # MediaPipe drawing utilities (styles are built once, not per frame)
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
+        self._landmark_style = self.mp_drawing_styles.get_default_hand_landmarks_style()
+        self._connection_style = self.mp_drawing_styles.get_default_hand_connections_style()
         
-        # EKF for each landmark (21 landmarks)
+        # EKF for all 21 landmarks, stepped together
         self.use_ekf = use_ekf
-        self.ekf_filters = [AdaptiveExtendedKalmanFilter() for _ in range(21)]
+        self.ekf = BatchedEKF(21)
+        
+        # Raw MediaPipe landmarks of the last detection (for `draw_overlay`)
+        self.hand_landmarks = None
         
-        # Hand landmarks
-        self.landmarks = None
+        # Hand landmarks: (21, 3) float32 array of (x, y, z), or None.
+        # A new array is produced every frame, so it is safe to keep a
+        # reference to it (GestureRecognizer does).
+        self.landmarks: Optional[np.ndarray] = None
         self.handedness = None
         self.measurement_confidence = 0.0
         
         # Tracking state
         self.is_tracking = False
         self.last_detection_time = 0
+        
+        # Helper results for the current landmarks (see `_per_frame`)
+        self._helper_cache = {}
+        
+        # Downscaled RGB copy of the frame for MediaPipe, reused while the
+        # size is unchanged
+        self.inference_width = inference_width
+        self._small_buf: Optional[np.ndarray] = None
+        self._rgb_buf: Optional[np.ndarray] = None
     
-    def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, bool]:
+    def process_frame(self, frame: np.ndarray, now: Optional[float] = None) -> Tuple[np.ndarray, bool]:
         """
         Process video frame and detect hands
         
         Args:
             frame: Input BGR image
+            now: Frame timestamp (`time.perf_counter()`); read once here if omitted
             
         Returns:
             Processed frame and detection status
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if now is None:
+            now = time.perf_counter()
+        self._helper_cache.clear()
+        
+        # Downscale and convert BGR to RGB (into reused buffers). Landmarks
+        # come back normalized, so they apply to the full frame unchanged.
+        rgb_frame = cv2.cvtColor(
+            self._inference_input(frame), cv2.COLOR_BGR2RGB, dst=self._rgb_buf
+        )
         
         # Process frame
         results = self.hands.process(rgb_frame)
@@ -187,7 +211,7 @@ class HandTracker:
         # Update tracking state
         if results.multi_hand_landmarks:
             self.is_tracking = True
-            self.last_detection_time = time.time()
+            self.last_detection_time = now
             
             # Get first hand
             hand_landmarks = results.multi_hand_landmarks[0]
@@ -198,62 +222,92 @@ class HandTracker:
             self.measurement_confidence = float(getattr(handed, "score", 0.8))
             
             # Extract and smooth landmarks
-            self.landmarks = self._extract_landmarks(hand_landmarks, frame.shape)
+            self.landmarks = self._extract_landmarks(hand_landmarks, frame.shape, now)
             
-            # Draw landmarks
-            self.mp_drawing.draw_landmarks(
-                frame,
-                hand_landmarks,
-                self.mp_hands.HAND_CONNECTIONS,
-                self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                self.mp_drawing_styles.get_default_hand_connections_style()
-            )
+            # Drawing is left to `draw_overlay`, so it can run on the UI thread
+            self.hand_landmarks = hand_landmarks
         else:
+            if self.is_tracking:
+                # Don't let a stale velocity fling the state when the hand
+                # is re-detected after a gap.
+                self.ekf.reset_velocities()
             self.is_tracking = False
             self.landmarks = None
+            self.hand_landmarks = None
             self.measurement_confidence = 0.0
         
         return frame, self.is_tracking
     
+    def draw_overlay(self, frame: np.ndarray, hand_landmarks=_LAST_DETECTION) -> np.ndarray:
+        """
+        Draw the hand skeleton onto `frame` (in place)
+        
+        Args:
+            frame: BGR image to draw on
+            hand_landmarks: MediaPipe landmarks to draw (None: no hand, nothing
+                is drawn); defaults to the last detection. Pass them explicitly
+                when drawing on another thread.
+        """
+        if hand_landmarks is _LAST_DETECTION:
+            hand_landmarks = self.hand_landmarks
+        if hand_landmarks is not None:
+            self.mp_drawing.draw_landmarks(
+                frame,
+                hand_landmarks,
+                self.mp_hands.HAND_CONNECTIONS,
+                self._landmark_style,
+                self._connection_style
+            )
+        return frame
+    
+    def _inference_input(self, frame: np.ndarray) -> np.ndarray:
+        """Return `frame` resized for inference; also sizes the RGB buffer"""
+        h, w = frame.shape[:2]
+        if self.inference_width and w > self.inference_width:
+            size = (self.inference_width, round(h * self.inference_width / w))
+            if self._small_buf is None or self._small_buf.shape[1::-1] != size:
+                self._small_buf = np.empty((size[1], size[0], 3), dtype=frame.dtype)
+            # INTER_AREA would alias less but is ~10x slower at non-integer
+            # scale factors; MediaPipe resamples bilinearly itself anyway.
+            frame = cv2.resize(frame, size, dst=self._small_buf, interpolation=cv2.INTER_LINEAR)
+        
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        return frame
+    
     def _extract_landmarks(self, 
                           hand_landmarks, 
-                          frame_shape: Tuple[int, int, int]) -> List[Tuple[float, float, float]]:
+                          frame_shape: Tuple[int, int, int],
+                          now: float) -> np.ndarray:
         """Extract and optionally smooth landmarks using EKF"""
-        h, w, _ = frame_shape
-        landmarks = []
+        # Raw measurements for all landmarks at once, filled straight from
+        # the protobuf fields (no per-landmark tuples or lists)
+        landmarks = hand_landmarks.landmark
+        measurements = np.fromiter(
+            chain.from_iterable(map(_XYZ, landmarks)),
+            dtype=np.float32,
+            count=3 * len(landmarks),
+        ).reshape(-1, 3)
+        
+        if not self.use_ekf:
+            return measurements
         
-        current_time = time.time()
         meas_conf = float(np.clip(self.measurement_confidence, 0.0, 1.0))
         
-        for idx, landmark in enumerate(hand_landmarks.landmark):
-            # Raw measurement
-            measurement = np.array([
-                landmark.x,
-                landmark.y,
-                landmark.z
-            ])
-            
-            if self.use_ekf:
-                # Calculate time delta
-                dt = current_time - self.ekf_filters[idx].last_time
-                self.ekf_filters[idx].last_time = current_time
-                
-                # Predict and update
-                self.ekf_filters[idx].predict(dt)
-                self.ekf_filters[idx].update(measurement, dt=dt, measurement_confidence=meas_conf)
-                
-                # Get smoothed position
-                smoothed_pos = self.ekf_filters[idx].get_position()
-                landmarks.append(tuple(smoothed_pos))
-            else:
-                landmarks.append((landmark.x, landmark.y, landmark.z))
-        
-        return landmarks
+        # Calculate time delta
+        dt = now - self.ekf.last_time
+        self.ekf.last_time = now
+        
+        # Predict and update (one compiled call for all landmarks)
+        self.ekf.step(measurements, dt=dt, measurement_confidence=meas_conf)
+        
+        # Get smoothed positions (a copy; the filter state keeps changing)
+        return self.ekf.get_positions().astype(np.float32)
     
     def get_landmark(self, landmark_id: int) -> Optional[Tuple[float, float, float]]:
         """Get specific landmark by ID (0-20)"""
-        if self.landmarks and 0 <= landmark_id < len(self.landmarks):
-            return self.landmarks[landmark_id]
+        if self.landmarks is not None and 0 <= landmark_id < len(self.landmarks):
+            return tuple(self.landmarks[landmark_id].tolist())
         return None
     
     def get_finger_tip(self, finger_name: str) -> Optional[Tuple[float, float, float]]:
@@ -275,31 +329,30 @@ class HandTracker:
             return self.get_landmark(finger_tips[finger_name.lower()])
         return None
     
+    @_per_frame
     def get_palm_center(self) -> Optional[Tuple[float, float, float]]:
         """Calculate palm center position"""
-        if not self.landmarks:
+        if self.landmarks is None:
             return None
         
         # Average of wrist and base of middle finger
-        wrist = np.array(self.landmarks[0])
-        middle_base = np.array(self.landmarks[9])
-        
-        palm_center = (wrist + middle_base) / 2
-        return tuple(palm_center)
+        palm_center = (self.landmarks[0] + self.landmarks[9]) / 2
+        return tuple(palm_center.tolist())
     
+    @_per_frame
     def get_hand_bounding_box(self, 
                              frame_shape: Tuple[int, int, int]) -> Optional[Tuple[int, int, int, int]]:
         """Get bounding box around hand"""
-        if not self.landmarks:
+        if self.landmarks is None:
             return None
         
         h, w, _ = frame_shape
         
-        x_coords = [lm[0] * w for lm in self.landmarks]
-        y_coords = [lm[1] * h for lm in self.landmarks]
+        x_coords = self.landmarks[:, 0] * w
+        y_coords = self.landmarks[:, 1] * h
         
-        x_min, x_max = int(min(x_coords)), int(max(x_coords))
-        y_min, y_max = int(min(y_coords)), int(max(y_coords))
+        x_min, x_max = int(x_coords.min()), int(x_coords.max())
+        y_min, y_max = int(y_coords.min()), int(y_coords.max())
         
         # Add padding
         padding = 20
@@ -310,57 +363,37 @@ class HandTracker:
         
         return (x_min, y_min, x_max, y_max)
     
+    @_per_frame
     def is_fist(self) -> bool:
         """Detect if hand is making a fist"""
-        if not self.landmarks:
+        if self.landmarks is None:
             return False
         
-        # Check if all fingers are closed
-        wrist = np.array(self.landmarks[0])
-        
-        # Check each finger tip distance to wrist
-        finger_tips = [4, 8, 12, 16, 20]
-        distances = []
-        
-        for tip_id in finger_tips:
-            tip = np.array(self.landmarks[tip_id])
-            distance = np.linalg.norm(tip - wrist)
-            distances.append(distance)
+        # Distance of each finger tip to the wrist
+        distances = np.linalg.norm(self.landmarks[_FINGERTIPS] - self.landmarks[0], axis=1)
         
         # If all fingertips are close to wrist, it's a fist
-        avg_distance = np.mean(distances)
-        return avg_distance < 0.15
+        return bool(distances.mean() < 0.15)
     
+    @_per_frame
     def is_open_palm(self) -> bool:
         """Detect if hand is showing open palm"""
-        if not self.landmarks:
+        if self.landmarks is None:
             return False
         
         # Check if all fingers are extended
-        wrist = np.array(self.landmarks[0])
-        
-        finger_tips = [4, 8, 12, 16, 20]
-        extended_count = 0
+        distances = np.linalg.norm(self.landmarks[_FINGERTIPS] - self.landmarks[0], axis=1)
+        extended_count = np.count_nonzero(distances > 0.2)
         
-        for tip_id in finger_tips:
-            tip = np.array(self.landmarks[tip_id])
-            distance = np.linalg.norm(tip - wrist)
-            if distance > 0.2:
-                extended_count += 1
-        
-        return extended_count >= 4
+        return bool(extended_count >= 4)
     
+    @_per_frame
     def get_pinch_distance(self) -> Optional[float]:
         """Get distance between thumb and index finger (for pinch gesture)"""
-        thumb_tip = self.get_finger_tip('thumb')
-        index_tip = self.get_finger_tip('index')
+        if self.landmarks is None:
+            return None
         
-        if thumb_tip and index_tip:
-            distance = np.linalg.norm(
-                np.array(thumb_tip) - np.array(index_tip)
-            )
-            return distance
-        return None
+        return float(np.linalg.norm(self.landmarks[4] - self.landmarks[8]))
     
     def release(self):
         """Release resources"""
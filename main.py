@@ -4,9 +4,28 @@ Hand Gesture Interaction System with EKF
 Main Application Entry Point
 """
 import argparse
+
+import cv2
+
 from core.orchestrator import HandTrackingOrchestrator
 
 
+def _enable_opencv_simd() -> None:
+    """Make sure OpenCV dispatches to its SIMD kernels and report which ones."""
+    # Another library may have switched the optimized code paths off.
+    cv2.setUseOptimized(True)
+    if not cv2.useOptimized():
+        print(" Warning: OpenCV optimized (SIMD) code paths are disabled")
+        return
+
+    features = [
+        line.strip()
+        for line in cv2.getBuildInformation().splitlines()
+        if line.strip().startswith(("Baseline:", "Dispatched code generation:"))
+    ]
+    print(" OpenCV SIMD: " + ("; ".join(features) if features else "enabled"))
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -47,6 +66,8 @@ Examples:
     print("  Advanced Vision-Based Interaction Project")
     print("="*60 + "\n")
     
+    _enable_opencv_simd()
+
     app = HandTrackingOrchestrator(mode=args.mode, use_ekf=not args.no_ekf)
     app.run(camera_id=args.camera)
 
@@ -0,0 +1,145 @@
+"""
+Low-level cursor backends for `VirtualMouse`.
+
+PyAutoGUI validates arguments, runs its fail-safe check and resolves the
+platform layer on every call, which is noticeable on a per-frame cursor path.
+Where possible we talk to the OS directly instead:
+
+- Windows: user32 `SetCursorPos` / `SendInput` (ctypes, no extra dependency)
+- Linux (X11): XTest through `python-xlib` (optional dependency)
+- Anything else: PyAutoGUI
+"""
+
+from __future__ import annotations
+
+import ctypes
+import sys
+
+import pyautogui
+
+
+class PyAutoGUIMouseBackend:
+    """Portable fallback backed by PyAutoGUI."""
+
+    name = "pyautogui"
+
+    def move(self, x: int, y: int) -> None:
+        pyautogui.moveTo(x, y, duration=0)
+
+    def press(self, button: str = "left") -> None:
+        pyautogui.mouseDown(button=button)
+
+    def release(self, button: str = "left") -> None:
+        pyautogui.mouseUp(button=button)
+
+    def click(self, button: str = "left") -> None:
+        pyautogui.click(button=button)
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.c_long),
+        ("dy", ctypes.c_long),
+        ("mouseData", ctypes.c_ulong),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUT_UNION(ctypes.Union):
+    # MOUSEINPUT is the largest member, so the union has the correct size.
+    _fields_ = [("mi", _MOUSEINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("u", _INPUT_UNION)]
+
+
+_INPUT_MOUSE = 0
+_WIN32_BUTTON_FLAGS = {
+    # button: (down, up)
+    "left": (0x0002, 0x0004),
+    "right": (0x0008, 0x0010),
+    "middle": (0x0020, 0x0040),
+}
+
+
+class Win32MouseBackend:
+    """Direct user32 calls (Windows only)."""
+
+    name = "win32"
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+
+    def move(self, x: int, y: int) -> None:
+        self._user32.SetCursorPos(int(x), int(y))
+
+    def _send(self, *flags: int) -> None:
+        inputs = (_INPUT * len(flags))()
+        for inp, flag in zip(inputs, flags):
+            inp.type = _INPUT_MOUSE
+            inp.u.mi.dwFlags = flag
+        self._user32.SendInput(len(flags), inputs, ctypes.sizeof(_INPUT))
+
+    def press(self, button: str = "left") -> None:
+        self._send(_WIN32_BUTTON_FLAGS[button][0])
+
+    def release(self, button: str = "left") -> None:
+        self._send(_WIN32_BUTTON_FLAGS[button][1])
+
+    def click(self, button: str = "left") -> None:
+        # Down + up in a single SendInput so nothing can interleave.
+        self._send(*_WIN32_BUTTON_FLAGS[button])
+
+
+_X11_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+
+class XTestMouseBackend:
+    """XTest fake input through python-xlib (Linux/X11 only)."""
+
+    name = "xtest"
+
+    def __init__(self):
+        from Xlib import X, display
+        from Xlib.ext import xtest
+
+        self._X = X
+        self._xtest = xtest
+        self._display = display.Display()
+
+    def move(self, x: int, y: int) -> None:
+        self._xtest.fake_input(self._display, self._X.MotionNotify, x=int(x), y=int(y))
+        self._display.flush()
+
+    def press(self, button: str = "left") -> None:
+        self._xtest.fake_input(self._display, self._X.ButtonPress, _X11_BUTTONS[button])
+        self._display.flush()
+
+    def release(self, button: str = "left") -> None:
+        self._xtest.fake_input(self._display, self._X.ButtonRelease, _X11_BUTTONS[button])
+        self._display.flush()
+
+    def click(self, button: str = "left") -> None:
+        code = _X11_BUTTONS[button]
+        self._xtest.fake_input(self._display, self._X.ButtonPress, code)
+        self._xtest.fake_input(self._display, self._X.ButtonRelease, code)
+        self._display.flush()
+
+
+def create_mouse_backend():
+    """Return the fastest cursor backend available on this system."""
+    if sys.platform.startswith("win"):
+        try:
+            return Win32MouseBackend()
+        except (AttributeError, OSError):
+            pass
+    elif sys.platform.startswith("linux"):
+        try:
+            return XTestMouseBackend()
+        except Exception:
+            # python-xlib missing, or no X display (e.g. Wayland-only session).
+            pass
+    return PyAutoGUIMouseBackend()
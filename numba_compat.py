@@ -0,0 +1,25 @@
+"""
+Optional Numba support.
+
+`njit` compiles with Numba when it is installed and is a plain pass-through
+decorator otherwise, so the numeric kernels stay importable (just slower)
+without it. `prange` likewise falls back to `range`.
+"""
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for `numba.njit` (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -74,10 +74,16 @@ class HandTrackingOrchestrator:
         """
         Process a raw camera frame into a display frame.
 
-        This method is safe to call from the processing thread.
+        This method is safe to call from the processing thread. The hand
+        skeleton is not drawn here; the UI thread draws it with
+        `HandTracker.draw_overlay` right before display.
         """
-        frame = cv2.flip(frame, 1)
-        frame, is_tracking = self.tracker.process_frame(frame)
+        now = time.perf_counter()
+
+        # Mirror in place: the processing thread owns the captured buffer
+        # until it passes it on to the UI (see CameraThread).
+        frame = cv2.flip(frame, 1, dst=frame)
+        frame, is_tracking = self.tracker.process_frame(frame, now=now)
 
         with self._state_lock:
             mode_name = self.mode_name
@@ -89,7 +95,7 @@ class HandTrackingOrchestrator:
                 self.tracker.landmarks, mode=mode_name
             )
 
-        fps = self.fps_counter.update(time.time())
+        fps = self.fps_counter.update(now)
         frame = draw_info_panel(frame, fps, gesture, mode_name, confidence)
 
         # Mode-specific work (can draw overlays and trigger actions).
@@ -121,7 +127,11 @@ class HandTrackingOrchestrator:
                 if pkt is None:
                     continue
 
+                if pkt.hand_landmarks is not None:
+                    self.tracker.draw_overlay(pkt.frame, pkt.hand_landmarks)
                 cv2.imshow(WINDOW_TITLE, pkt.frame)
+                # imshow keeps its own copy; the buffer can be captured into again
+                pipeline.recycle(pkt)
                 key = cv2.waitKey(1) & 0xFF
 
                 if key == ord("q"):
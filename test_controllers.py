@@ -0,0 +1,140 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import controllers
+from controllers import AirDrawing
+
+
+CANVAS_SIZE = (640, 480)
+# A power of two, so the fake clock advances by exactly this much per frame
+FRAME_DT = 1.0 / 32.0
+
+
+def _stroke(start, end, frames):
+    """Straight-line pen positions (normalized) from `start` to `end`."""
+    return [
+        (start[0] + (end[0] - start[0]) * i / (frames - 1),
+         start[1] + (end[1] - start[1]) * i / (frames - 1))
+        for i in range(frames)
+    ]
+
+
+def make_sequence():
+    """(x, y, is_drawing) per frame: two strokes separated by a pen-up."""
+    seq = [(x, y, True) for x, y in _stroke((0.20, 0.30), (0.60, 0.45), 12)]
+    seq += [(0.60, 0.45, False)] * 3
+    # A slow stroke first (thick line), then a fast one (thin line)
+    seq += [(x, y, True) for x, y in _stroke((0.50, 0.70), (0.52, 0.72), 6)]
+    seq += [(x, y, True) for x, y in _stroke((0.52, 0.72), (0.10, 0.20), 8)]
+    return seq
+
+
+def reference_segments(seq, adaptive, width=640, height=480,
+                       buffer_size=5, min_distance=3, thickness=5,
+                       min_thickness=3, max_thickness=8):
+    """
+    The original list-based `AirDrawing.update`, returning what it drew:
+    ("dot", point) for a stroke start and ("line", p1, p2, thickness) per segment.
+    """
+    drawn = []
+    point_buffer = []
+    last_drawn_point = None
+    for x, y, is_drawing in seq:
+        canvas_x = int(np.clip(x * width, 0, width - 1))
+        canvas_y = int(np.clip(y * height, 0, height - 1))
+
+        point_buffer.append((canvas_x, canvas_y))
+        if len(point_buffer) > buffer_size:
+            point_buffer.pop(0)
+        weights = np.linspace(0.5, 1.0, len(point_buffer))
+        weights = weights / weights.sum()
+        smoothed = (int(sum(p[0] * w for p, w in zip(point_buffer, weights))),
+                    int(sum(p[1] * w for p, w in zip(point_buffer, weights))))
+
+        if not is_drawing:
+            last_drawn_point = None
+            point_buffer.clear()
+        elif last_drawn_point is None:
+            last_drawn_point = smoothed
+            drawn.append(("dot", smoothed))
+        else:
+            distance = np.sqrt((last_drawn_point[0] - smoothed[0]) ** 2
+                               + (last_drawn_point[1] - smoothed[1]) ** 2)
+            if distance >= min_distance:
+                t = thickness
+                if adaptive:
+                    speed = distance / FRAME_DT
+                    normalized_speed = np.clip(speed / 1000.0, 0, 1)
+                    t = max(min_thickness, int(max_thickness - normalized_speed
+                                               * (max_thickness - min_thickness)))
+                drawn.append(("line", last_drawn_point, smoothed, t))
+                last_drawn_point = smoothed
+    return drawn
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_drawer(seq, adaptive):
+    """Feed `seq` through AirDrawing.update; returns (drawer, what it drew)."""
+    clock = _FakeClock()
+    with mock.patch.object(controllers.time, "monotonic", clock):
+        drawer = AirDrawing(canvas_size=CANVAS_SIZE)
+        drawer.set_adaptive_thickness(adaptive)
+
+        drawn = []
+        draw_smooth_line = drawer._draw_smooth_line
+
+        def record(p1, p2, thickness):
+            drawn.append(("line", p1, p2, thickness))
+            draw_smooth_line(p1, p2, thickness)
+
+        drawer._draw_smooth_line = record
+        for x, y, is_drawing in seq:
+            clock.now += FRAME_DT
+            was_drawing = drawer.last_drawn_point is not None
+            drawer.update(x, y, is_drawing)
+            if is_drawing and not was_drawing:
+                drawn.append(("dot", drawer.last_drawn_point))
+    return drawer, drawn
+
+
+class TestAirDrawing(unittest.TestCase):
+    def test_fixed_thickness_matches_reference(self):
+        seq = make_sequence()
+        _, drawn = run_drawer(seq, adaptive=False)
+        self.assertEqual(drawn, reference_segments(seq, adaptive=False))
+
+    def test_adaptive_thickness_matches_reference(self):
+        seq = make_sequence()
+        _, drawn = run_drawer(seq, adaptive=True)
+        expected = reference_segments(seq, adaptive=True)
+        self.assertEqual(drawn, expected)
+        # Both the slow and the fast stroke are exercised
+        thicknesses = {d[3] for d in expected if d[0] == "line"}
+        self.assertGreater(len(thicknesses), 1)
+
+    def test_segments_are_drawn_immediately(self):
+        seq = [(x, y, True) for x, y in _stroke((0.20, 0.30), (0.30, 0.35), 4)]
+        drawer, drawn = run_drawer(seq, adaptive=False)
+        self.assertGreater(len(drawn), 1)
+
+        # Every segment is on the canvas as soon as `update` returns
+        p1, p2 = drawn[-1][1], drawn[-1][2]
+        for x, y in (p1, p2, ((p1[0] + p2[0]) // 2, (p1[1] + p2[1]) // 2)):
+            self.assertTrue(drawer.canvas[y, x].any())
+
+        x0, y0, x1, y1 = drawer.ink_bbox
+        inside = np.count_nonzero(drawer.canvas[y0:y1, x0:x1])
+        self.assertEqual(inside, np.count_nonzero(drawer.canvas))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+
+import numpy as np
+
+from ekf_kernel import PACKED_INDEX, PACKED_SIZE, predict_update_all, unpack_covariance
+
+
+BASE_Q = 1e-4
+BASE_R = 5e-3
+SPEED_FAST = 1.5
+
+
+def pack_covariance(P):
+    """Inverse of `unpack_covariance` for symmetric (..., 6, 6) matrices."""
+    packed = np.empty(P.shape[:-2] + (PACKED_SIZE,), dtype=P.dtype)
+    for i in range(6):
+        for j in range(i, 6):
+            packed[..., PACKED_INDEX[i, j]] = P[..., i, j]
+    return packed
+
+
+def reference_step(state, P, q_scale, last_meas, meas, dt, conf, has_last):
+    """
+    One predict + adaptive-noise + Joseph-form update per landmark with plain
+    NumPy matrices (no static skip). Returns new (state, P, q_scale).
+    """
+    state = state.copy()
+    P = P.copy()
+    q_scale = q_scale.copy()
+    F = np.eye(6)
+    F[0, 3] = F[1, 4] = F[2, 5] = dt
+    for k in range(len(state)):
+        # Predict
+        state[k] = F @ state[k]
+        P[k] = F @ P[k] @ F.T + np.eye(6) * (BASE_Q * q_scale[k])
+
+        # Adapt Q/R to the measured speed
+        speed = np.linalg.norm(meas[k] - last_meas[k]) / dt if has_last else 0.0
+        motion = np.clip(speed / SPEED_FAST, 0.0, 1.0)
+        q_scale[k] = 0.05 + 1.95 * motion
+        r = BASE_R * (5.0 - 4.2 * motion) / conf
+
+        # Sequential scalar updates, Joseph form
+        for i in range(3):
+            s = P[k, i, i] + r
+            K = P[k, :, i] / s
+            state[k] += K * (meas[k, i] - state[k, i])
+            A = np.eye(6)
+            A[:, i] -= K
+            P[k] = A @ P[k] @ A.T + np.outer(K, K) * r
+    return state, P, q_scale
+
+
+def random_inputs(rng, n=21):
+    state = rng.uniform(-1.0, 1.0, (n, 6))
+    M = rng.normal(size=(n, 6, 6)) * 0.1
+    P = M @ M.transpose(0, 2, 1) + np.eye(6) * 1e-3
+    q_scale = rng.uniform(0.05, 2.0, n)
+    last_meas = state[:, :3] + rng.normal(scale=0.02, size=(n, 3))
+    meas = last_meas + rng.normal(scale=0.02, size=(n, 3))
+    return state, P, q_scale, last_meas, meas
+
+
+class TestPredictUpdateAll(unittest.TestCase):
+    def test_pack_round_trip(self):
+        rng = np.random.default_rng(0)
+        _, P, _, _, _ = random_inputs(rng, n=3)
+        np.testing.assert_array_equal(unpack_covariance(pack_covariance(P)), P)
+
+    def test_matches_numpy_predict_and_joseph_update(self):
+        rng = np.random.default_rng(1)
+        for has_last in (True, False):
+            state, P, q_scale, last_meas, meas = random_inputs(rng)
+            dt, conf = 1.0 / 30.0, 0.8
+            expected = reference_step(state, P, q_scale, last_meas, meas, dt, conf, has_last)
+
+            packed = pack_covariance(P)
+            last = last_meas.copy()
+            # static_delta=0 disables the static skip
+            predict_update_all(state, packed, q_scale, last, meas, dt, conf, has_last,
+                               BASE_Q, BASE_R, SPEED_FAST, 0.0)
+
+            np.testing.assert_allclose(state, expected[0], rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(unpack_covariance(packed), expected[1], rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(q_scale, expected[2], rtol=1e-12)
+            np.testing.assert_array_equal(last, meas)
+
+    def test_float32_matches_float64(self):
+        rng = np.random.default_rng(2)
+        state, P, q_scale, last_meas, meas = random_inputs(rng)
+        args64 = (state.copy(), pack_covariance(P), q_scale.copy(), last_meas.copy(), meas)
+        args32 = tuple(a.astype(np.float32) for a in args64)
+        for args in (args64, args32):
+            predict_update_all(*args, 1.0 / 30.0, 1.0, True, BASE_Q, BASE_R, SPEED_FAST, 0.0)
+        np.testing.assert_allclose(args32[0], args64[0], atol=1e-5)
+        np.testing.assert_allclose(args32[1], args64[1], atol=1e-5)
+
+    def test_static_landmarks_skip_the_step(self):
+        rng = np.random.default_rng(3)
+        state, P, q_scale, last_meas, meas = random_inputs(rng)
+        static_delta = 1e-3
+        # Landmarks 0..9 barely move; the rest move by much more than static_delta
+        meas[:10] = last_meas[:10] + rng.uniform(-0.5, 0.5, (10, 3)) * static_delta
+        meas[10:] = last_meas[10:] + 0.05
+
+        packed = pack_covariance(P)
+        packed_before = packed.copy()
+        q_before = q_scale.copy()
+        last = last_meas.copy()
+        new_state = state.copy()
+        predict_update_all(new_state, packed, q_scale, last, meas, 1.0 / 30.0, 1.0, True,
+                           BASE_Q, BASE_R, SPEED_FAST, static_delta)
+
+        # Static: position snaps to the measurement, velocity zeroed, P and Q kept
+        np.testing.assert_array_equal(new_state[:10, :3], meas[:10])
+        np.testing.assert_array_equal(new_state[:10, 3:], 0.0)
+        np.testing.assert_array_equal(packed[:10], packed_before[:10])
+        np.testing.assert_array_equal(q_scale[:10], q_before[:10])
+        np.testing.assert_array_equal(last, meas)
+
+        # Moving: the regular filter step
+        expected = reference_step(state[10:], P[10:], q_before[10:], last_meas[10:], meas[10:],
+                                  1.0 / 30.0, 1.0, True)
+        np.testing.assert_allclose(new_state[10:], expected[0], rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(unpack_covariance(packed[10:]), expected[1], rtol=1e-9, atol=1e-12)
+
+    def test_no_skip_without_previous_measurement(self):
+        rng = np.random.default_rng(4)
+        state, P, q_scale, _, meas = random_inputs(rng)
+        packed = pack_covariance(P)
+        packed_before = packed.copy()
+        # Identical "previous" measurement, but has_last=False: every landmark is updated
+        predict_update_all(state, packed, q_scale, meas.copy(), meas, 1.0 / 30.0, 1.0, False,
+                           BASE_Q, BASE_R, SPEED_FAST, 1e-3)
+        self.assertTrue(np.all(np.any(packed != packed_before, axis=1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -106,6 +106,12 @@ class TestGestureRecognizer(unittest.TestCase):
         # This makes the test robust to future tuning of thresholds.
         self.assertIsNotNone(result)
 
+    def test_count_fingers_rejects_short_landmark_list(self):
+        gr = GestureRecognizer()
+        self.assertEqual(gr.count_fingers([]), 0)
+        with self.assertRaises(ValueError):
+            gr.count_fingers([(0.1, 0.2, 0.0)] * 5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import utils
+from utils import FPSCounter, MovingAverageFilter, count_extended_fingers, count_extended_fingers_np
+from utils_numba import analyze_landmarks
+
+
+class ListMovingAverageFilter:
+    """The original list-based MovingAverageFilter."""
+
+    def __init__(self, window_size=5):
+        self.window_size = window_size
+        self.values = []
+
+    def update(self, value):
+        self.values.append(value)
+        if len(self.values) > self.window_size:
+            self.values.pop(0)
+        return np.mean(self.values)
+
+    def reset(self):
+        self.values = []
+
+
+class ListFPSCounter:
+    """The original list-based FPSCounter."""
+
+    def __init__(self, window_size=30):
+        self.window_size = window_size
+        self.timestamps = []
+
+    def update(self, timestamp):
+        self.timestamps.append(timestamp)
+        if len(self.timestamps) > self.window_size:
+            self.timestamps.pop(0)
+        if len(self.timestamps) < 2:
+            return 0.0
+        time_diff = self.timestamps[-1] - self.timestamps[0]
+        return (len(self.timestamps) - 1) / (time_diff + 1e-6)
+
+
+def numpy_count(landmarks):
+    """count_extended_fingers_np through its NumPy (non-Numba) path."""
+    with mock.patch.object(utils, "NUMBA_AVAILABLE", False):
+        return count_extended_fingers_np(landmarks)
+
+
+def threshold_landmarks(rng, scale):
+    """
+    Random hand whose index..pinky tips sit at `scale` times the PIP
+    distance from the wrist, along the same direction as the PIP.
+    """
+    lm = rng.uniform(0.2, 0.8, (21, 3))
+    wrist = lm[0]
+    for tip, pip in ((8, 6), (12, 10), (16, 14), (20, 18)):
+        lm[tip] = wrist + (lm[pip] - wrist) * scale
+    return lm
+
+
+class TestMovingAverageFilter(unittest.TestCase):
+    def test_matches_list_implementation(self):
+        rng = np.random.default_rng(0)
+        for window_size in (1, 2, 5, 7):
+            new, old = MovingAverageFilter(window_size), ListMovingAverageFilter(window_size)
+            for i, value in enumerate(rng.uniform(-100.0, 100.0, 200)):
+                if i == 120:
+                    new.reset()
+                    old.reset()
+                self.assertAlmostEqual(new.update(value), old.update(value), places=9)
+
+
+class TestFPSCounter(unittest.TestCase):
+    def test_matches_list_implementation(self):
+        rng = np.random.default_rng(1)
+        timestamps = 1000.0 + np.cumsum(rng.uniform(0.01, 0.05, 300))
+        for window_size in (2, 3, 30):
+            new, old = FPSCounter(window_size), ListFPSCounter(window_size)
+            for t in timestamps:
+                self.assertAlmostEqual(new.update(t), old.update(t), delta=1e-6)
+
+    def test_single_timestamp_window_reports_zero(self):
+        new, old = FPSCounter(window_size=1), ListFPSCounter(window_size=1)
+        for t in (0.0, 0.03, 0.07, 0.1):
+            self.assertEqual(new.update(t), 0.0)
+            self.assertEqual(old.update(t), 0.0)
+
+
+class TestCountExtendedFingers(unittest.TestCase):
+    def test_short_list_counts_zero(self):
+        self.assertEqual(count_extended_fingers([(0.1, 0.2, 0.0)] * 5), 0)
+
+    def test_list_and_array_inputs_agree(self):
+        rng = np.random.default_rng(2)
+        for _ in range(200):
+            lm = rng.uniform(0.0, 1.0, (21, 3))
+            self.assertEqual(count_extended_fingers(lm.tolist()), count_extended_fingers_np(lm))
+
+    def test_numba_and_numpy_agree_at_threshold(self):
+        rng = np.random.default_rng(3)
+        # |tip| / |pip| around 1.1, i.e. |tip|^2 around 1.21 |pip|^2
+        scales = 1.1 + np.array([-1e-6, -1e-12, -1e-15, 0.0, 1e-15, 1e-12, 1e-6])
+        for dtype in (np.float64, np.float32):
+            for scale in scales:
+                for _ in range(20):
+                    lm = threshold_landmarks(rng, scale).astype(dtype)
+                    with self.subTest(dtype=dtype.__name__, scale=scale):
+                        self.assertEqual(int(analyze_landmarks(lm)[0]), numpy_count(lm))
+
+    def test_threshold_is_strict(self):
+        rng = np.random.default_rng(4)
+        below = threshold_landmarks(rng, 1.1 - 1e-6)
+        above = below.copy()
+        wrist = below[0]
+        for tip, pip in ((8, 6), (12, 10), (16, 14), (20, 18)):
+            above[tip] = wrist + (below[pip] - wrist) * (1.1 + 1e-6)
+        thumb = int(below[4, 0] < below[3, 0])
+        for count in (numpy_count, lambda lm: int(analyze_landmarks(lm)[0])):
+            self.assertEqual(count(below), thumb)
+            self.assertEqual(count(above), thumb + 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,66 +9,243 @@ Design goals:
 
 from __future__ import annotations
 
+import ctypes
+import os
 import queue
+import sys
 import threading
 import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Callable, Generic, Optional, Tuple, TypeVar
 
 import cv2
 import numpy as np
-import sys
 
-from constants import CAMERA_FRAME_HEIGHT, CAMERA_FRAME_WIDTH, CAMERA_TARGET_FPS
+from camera_diag import open_low_latency_capture
+
+# Optional CPU pinning: "<camera core>,<processing core>", e.g. "2,3".
+# Off by default: threads started from a pinned thread (OpenCV / MediaPipe
+# worker pools) inherit its single-core mask, which can cost more than
+# migrations save on a machine that is otherwise idle.
+PIN_CORES_ENV = "HAND_TRACKING_PIN_CORES"
+
+# How long `ThreadedPipeline.start` waits for the first camera frame. Some
+# DirectShow cameras take close to a second to deliver it.
+FIRST_FRAME_TIMEOUT_S = 2.0
+
+
+def pin_thread(native_id: int, core: int) -> bool:
+    """
+    Restrict one OS thread to a single CPU core.
+
+    Returns:
+        True if the affinity was applied, False if unsupported or refused.
+    """
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            # Linux: a thread id is accepted wherever a pid is.
+            os.sched_setaffinity(native_id, {core})
+            return True
+        if sys.platform.startswith("win"):
+            kernel32 = ctypes.windll.kernel32
+            thread_set_query_information = 0x0020 | 0x0040
+            handle = kernel32.OpenThread(thread_set_query_information, False, native_id)
+            if not handle:
+                return False
+            try:
+                return bool(kernel32.SetThreadAffinityMask(handle, 1 << core))
+            finally:
+                kernel32.CloseHandle(handle)
+    except (AttributeError, OSError, ValueError):
+        pass
+    return False
+
+
+def _pin_cores_from_env() -> Optional[Tuple[int, int]]:
+    value = os.environ.get(PIN_CORES_ENV, "").strip()
+    if not value:
+        return None
+    try:
+        camera_core, processing_core = (int(part) for part in value.split(","))
+    except ValueError:
+        print(f" Ignoring {PIN_CORES_ENV}={value!r} (expected '<core>,<core>')")
+        return None
+    return camera_core, processing_core
+
+
+T = TypeVar("T")
+
+
+class LatestSlot(Generic[T]):
+    """
+    Single-producer / single-consumer hand-off of the newest item.
+
+    A drop-in for the `queue.Queue(maxsize=1)` + "drop the old item" pattern:
+    `put_nowait` never blocks and replaces an unread item, `get` returns the
+    newest item not returned before (or raises `queue.Empty` on timeout).
+
+    The item is published as one (sequence, item) tuple, and rebinding an
+    attribute is atomic under the GIL, so the data path takes no lock; only
+    the wake-up goes through an Event.
+    """
+
+    def __init__(self):
+        self._latest: Tuple[int, Optional[T]] = (0, None)
+        self._last_read = 0
+        self._ready = threading.Event()
+
+    def put_nowait(self, item: T) -> None:
+        self._latest = (self._latest[0] + 1, item)
+        # Event.set takes a lock; skip it while the consumer has not woken yet.
+        # (If it clears the flag right after this check, it then reads the
+        # item stored above, so nothing is lost.)
+        if not self._ready.is_set():
+            self._ready.set()
+
+    def get(self, timeout: Optional[float] = None) -> T:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            if not self._ready.wait(remaining):
+                raise queue.Empty
+            self._ready.clear()
+            seq, item = self._latest
+            if seq != self._last_read:
+                self._last_read = seq
+                return item
+            # Woken for an item already returned (put raced the clear); wait again.
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProcessedPacket:
     """One processed output packet."""
 
     frame: np.ndarray
     timestamp: float
+    # Raw MediaPipe landmarks for the frame; the skeleton is drawn on the UI
+    # thread (see HandTracker.draw_overlay) to keep it off the processing path.
+    hand_landmarks: Optional[object] = None
+    # Whether `frame` is a camera buffer, to hand back with
+    # `ThreadedPipeline.recycle` once it has been displayed
+    recyclable: bool = False
 
 
 class CameraThread(threading.Thread):
     """
-    Camera reader thread that pushes the newest frame into a size-1 queue.
+    Camera reader thread that publishes the newest frame to a `LatestSlot`.
     Older frames are dropped automatically (smart frame skipping).
+
+    Frames are decoded into reused buffers instead of a new allocation per
+    frame. Ownership of a buffer passes with the frame: camera thread ->
+    raw slot -> processing (which mirrors and draws on it in place) -> UI.
+    The camera thread only writes into buffers handed back through
+    `recycle()`, which the last holder calls once it is done with the frame;
+    it allocates a new buffer when none is free. Frames dropped on the way
+    (replaced in a slot before being read) are simply garbage collected, so
+    a stalled consumer never has its frame overwritten.
+
+    When processing is slower than the camera, frames that would be replaced
+    before the consumer is free are grabbed but not decoded (see
+    `ProcessingThread.busy_until`), saving the decode and copy of frames that
+    would be dropped anyway.
     """
 
-    def __init__(self, camera_id: int, out_queue: "queue.Queue[np.ndarray]", cap: Optional[cv2.VideoCapture] = None):
+    def __init__(
+        self,
+        camera_id: int,
+        out_queue: "LatestSlot[np.ndarray]",
+        cap: Optional[cv2.VideoCapture] = None,
+        consumer: Optional["ProcessingThread"] = None,
+    ):
         super().__init__(daemon=True)
         self.camera_id = camera_id
         self.out_queue = out_queue
         self._stop_event = threading.Event()
         self._cap: Optional[cv2.VideoCapture] = cap
         self.open_ok: bool = cap is not None and cap.isOpened() if cap is not None else False
+        # Buffers handed back by their last holder, free to decode into
+        # (re-allocated by OpenCV only if the frame size changes)
+        self._free: "queue.SimpleQueue[np.ndarray]" = queue.SimpleQueue()
+        self.consumer = consumer
+        # EMA of the time between grabbed frames (s)
+        self.frame_period = 0.0
+        # Set once the first frame has been published
+        self.first_frame = threading.Event()
+        # See `release_on_exit`
+        self._release_lock = threading.Lock()
+        self._release_on_exit = False
+        self._exited = False
 
     def run(self) -> None:
+        try:
+            self._capture_loop()
+        finally:
+            with self._release_lock:
+                self._exited = True
+                if self._release_on_exit:
+                    self._cap.release()
+
+    def _capture_loop(self) -> None:
         if self._cap is None or not self.open_ok:
             return
 
         # Settings are already applied if cap was passed from main thread
 
+        last_grab = None
         while not self._stop_event.is_set():
-            ret, frame = self._cap.read()
-            if not ret:
-                time.sleep(0.005)
+            if not self._cap.grab():
+                # Retry soon; returns at once when stop() is called.
+                self._stop_event.wait(0.001)
+                continue
+            now = time.perf_counter()
+            if last_grab is not None:
+                period = now - last_grab
+                self.frame_period = period if self.frame_period == 0.0 else 0.9 * self.frame_period + 0.1 * period
+            last_grab = now
+
+            # Skip decoding if the next frame (with 2 ms of slack) will still
+            # arrive before the consumer takes one.
+            if self.consumer is not None and now + self.frame_period + 0.002 < self.consumer.busy_until:
                 continue
 
-            # Keep only the newest frame.
             try:
-                _ = self.out_queue.get_nowait()
+                buf = self._free.get_nowait()
             except queue.Empty:
-                pass
-            try:
-                self.out_queue.put_nowait(frame)
-            except queue.Full:
-                pass
+                buf = None
+            ret, frame = self._cap.retrieve(buf)
+            if not ret:
+                if buf is not None:
+                    self._free.put(buf)
+                continue
+
+            # Keep only the newest frame (replaces an unread one).
+            self.out_queue.put_nowait(frame)
+            if not self.first_frame.is_set():
+                self.first_frame.set()
+
+    def recycle(self, frame: np.ndarray) -> None:
+        """Hand back a published frame; it must not be used afterwards."""
+        self._free.put(frame)
+
+    def release_on_exit(self) -> bool:
+        """
+        Have the thread release the capture when it exits.
+
+        For a thread that did not stop in time: releasing a VideoCapture
+        while `grab()` blocks in it on this thread is undefined behaviour.
+
+        Returns:
+            False if the thread has already exited (the caller releases).
+        """
+        with self._release_lock:
+            if self._exited:
+                return False
+            self._release_on_exit = True
+            return True
 
     def stop(self) -> None:
         self._stop_event.set()
-        # Note: Camera release is handled by ThreadedPipeline.stop() in main thread
+        # Note: Camera release is handled by ThreadedPipeline (see _release_capture)
 
 
 class ProcessingThread(threading.Thread):
@@ -78,8 +255,8 @@ class ProcessingThread(threading.Thread):
 
     def __init__(
         self,
-        in_queue: "queue.Queue[np.ndarray]",
-        out_queue: "queue.Queue[ProcessedPacket]",
+        in_queue: "LatestSlot[np.ndarray]",
+        out_queue: "LatestSlot[ProcessedPacket]",
         orchestrator,
     ):
         super().__init__(daemon=True)
@@ -87,6 +264,12 @@ class ProcessingThread(threading.Thread):
         self.out_queue = out_queue
         self.orchestrator = orchestrator
         self._stop_event = threading.Event()
+        # EMA of the processing time per frame (s), and the perf_counter time
+        # the current frame is expected to be done (read by the camera thread).
+        self.frame_time = 0.0
+        self.busy_until = 0.0
+        # Hands camera buffers back (CameraThread.recycle); set by the pipeline
+        self.recycle: Optional[Callable[[np.ndarray], None]] = None
 
     def run(self) -> None:
         while not self._stop_event.is_set():
@@ -95,18 +278,29 @@ class ProcessingThread(threading.Thread):
             except queue.Empty:
                 continue
 
+            t0 = time.perf_counter()
+            self.busy_until = t0 + self.frame_time
             processed = self.orchestrator.process_frame(frame)
-            pkt = ProcessedPacket(frame=processed, timestamp=time.time())
+            # Free again: from here on every captured frame is wanted, however
+            # far off the estimate was (e.g. after a slow first frame).
+            self.busy_until = 0.0
+            dt = time.perf_counter() - t0
+            self.frame_time = dt if self.frame_time == 0.0 else 0.9 * self.frame_time + 0.1 * dt
+            # Normally the camera buffer itself (processed in place), which
+            # the UI then owns; otherwise the buffer is free again unless the
+            # output still points into it.
+            recyclable = processed is frame
+            if not recyclable and self.recycle is not None and not np.may_share_memory(processed, frame):
+                self.recycle(frame)
+            pkt = ProcessedPacket(
+                frame=processed,
+                timestamp=time.perf_counter(),
+                hand_landmarks=self.orchestrator.tracker.hand_landmarks,
+                recyclable=recyclable,
+            )
 
             # Keep only the newest processed output.
-            try:
-                _ = self.out_queue.get_nowait()
-            except queue.Empty:
-                pass
-            try:
-                self.out_queue.put_nowait(pkt)
-            except queue.Full:
-                pass
+            self.out_queue.put_nowait(pkt)
 
     def stop(self) -> None:
         self._stop_event.set()
@@ -121,27 +315,21 @@ class ThreadedPipeline:
         self.camera_id = camera_id
         self.orchestrator = orchestrator
 
-        self._raw_queue: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=1)
-        self._out_queue: "queue.Queue[ProcessedPacket]" = queue.Queue(maxsize=1)
+        self._raw_queue: "LatestSlot[np.ndarray]" = LatestSlot()
+        self._out_queue: "LatestSlot[ProcessedPacket]" = LatestSlot()
         
         # Open camera in main thread for better reliability on Windows
-        self._cap: Optional[cv2.VideoCapture] = None
-        if sys.platform.startswith("win") and hasattr(cv2, "CAP_DSHOW"):
-            self._cap = cv2.VideoCapture(camera_id, cv2.CAP_DSHOW)
-        else:
-            self._cap = cv2.VideoCapture(camera_id)
-        
-        if self._cap.isOpened():
-            self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_FRAME_WIDTH)
-            self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_FRAME_HEIGHT)
-            self._cap.set(cv2.CAP_PROP_FPS, CAMERA_TARGET_FPS)
-            self.camera_thread = CameraThread(camera_id=camera_id, out_queue=self._raw_queue, cap=self._cap)
-        else:
-            self.camera_thread = CameraThread(camera_id=camera_id, out_queue=self._raw_queue, cap=None)
-        
+        self._cap: Optional[cv2.VideoCapture] = open_low_latency_capture(camera_id)
+
         self.processing_thread = ProcessingThread(
             in_queue=self._raw_queue, out_queue=self._out_queue, orchestrator=orchestrator
         )
+        
+        cap = self._cap if self._cap.isOpened() else None
+        self.camera_thread = CameraThread(
+            camera_id=camera_id, out_queue=self._raw_queue, cap=cap, consumer=self.processing_thread
+        )
+        self.processing_thread.recycle = self.camera_thread.recycle
 
     def start(self) -> bool:
         if not self.camera_thread.open_ok:
@@ -150,27 +338,61 @@ class ThreadedPipeline:
             return False
         
         self.camera_thread.start()
-        # Give the camera thread a moment to start reading
-        time.sleep(0.1)
+        # Opened is not the same as streaming: fail here if no frame arrives
+        if not self.camera_thread.first_frame.wait(FIRST_FRAME_TIMEOUT_S):
+            self.camera_thread.stop()
+            self.camera_thread.join(timeout=1.0)
+            self._release_capture()
+            return False
         self.processing_thread.start()
+        self._pin_threads()
         return True
 
+    def _pin_threads(self) -> None:
+        """Pin camera/processing threads to the cores in PIN_CORES_ENV, if set."""
+        cores = _pin_cores_from_env()
+        if cores is None:
+            return
+        for thread, core in zip((self.camera_thread, self.processing_thread), cores):
+            if not pin_thread(thread.native_id, core):
+                print(f" Could not pin {type(thread).__name__} to core {core}")
+
     def get_latest(self, timeout: float = 0.5) -> Optional[ProcessedPacket]:
         try:
             return self._out_queue.get(timeout=timeout)
         except queue.Empty:
             return None
 
+    def recycle(self, pkt: ProcessedPacket) -> None:
+        """
+        Return a displayed packet's frame buffer for reuse by the camera.
+
+        Call once nothing reads or writes `pkt.frame` any more. Optional:
+        without it the camera thread allocates a new buffer per frame.
+        """
+        if pkt.recyclable:
+            self.camera_thread.recycle(pkt.frame)
+
     def stop(self) -> None:
         self.camera_thread.stop()
         self.processing_thread.stop()
         # Wait for threads to finish
         self.camera_thread.join(timeout=1.0)
         self.processing_thread.join(timeout=1.0)
-        # Release camera in main thread
-        if self._cap is not None:
-            try:
-                self._cap.release()
-            except Exception:
-                pass
+        self._release_capture()
+
+    def _release_capture(self) -> None:
+        """
+        Release the camera in the main thread, unless the camera thread is
+        still stuck in `grab()` (e.g. V4L2 / MSMF waiting for a frame); it
+        then releases the camera itself once the call returns.
+        """
+        if self._cap is None:
+            return
+        if self.camera_thread.is_alive() and self.camera_thread.release_on_exit():
+            return
+        try:
+            self._cap.release()
+        except Exception:
+            pass
 
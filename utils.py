@@ -1,15 +1,32 @@
 """
 Utility Functions for Hand Tracking System
 """
+import math
+import time
+from collections import deque
+
 import numpy as np
 import cv2
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
+
+from numba_compat import NUMBA_AVAILABLE
+
+# Tip and PIP joint landmark ids of index, middle, ring and pinky
+_FINGER_TIPS = np.array([8, 12, 16, 20])
+_FINGER_PIPS = np.array([6, 10, 14, 18])
+
+# Colors (BGR) used by draw_hand_landmarks
+_CONNECTION_COLOR = (0, 255, 0)
+_LANDMARK_COLOR = (255, 0, 0)
 
 
 def calculate_distance(point1: Tuple[float, float, float], 
                        point2: Tuple[float, float, float]) -> float:
     """Calculate Euclidean distance between two 3D points"""
-    return np.sqrt(sum((a - b) ** 2 for a, b in zip(point1, point2)))
+    dx = point1[0] - point2[0]
+    dy = point1[1] - point2[1]
+    dz = point1[2] - point2[2]
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
 
 
 def calculate_angle(point1: np.ndarray, 
@@ -48,75 +65,81 @@ def is_finger_extended(finger_tip: np.ndarray,
                       finger_mcp: np.ndarray, 
                       wrist: np.ndarray) -> bool:
     """Check if a finger is extended based on joint positions"""
-    # Calculate distances
-    tip_to_wrist = np.linalg.norm(finger_tip - wrist)
-    pip_to_wrist = np.linalg.norm(finger_pip - wrist)
+    # Squared distances (the comparison below does not need the sqrt)
+    tip = finger_tip - wrist
+    pip = finger_pip - wrist
+    tip_to_wrist_sq = np.dot(tip, tip)
+    pip_to_wrist_sq = np.dot(pip, pip)
     
     # Finger is extended if tip is farther from wrist than PIP joint
-    return tip_to_wrist > pip_to_wrist * 1.1
+    # (|tip| > 1.1 |pip|  <=>  |tip|^2 > 1.21 |pip|^2)
+    return bool(tip_to_wrist_sq > 1.21 * pip_to_wrist_sq)
 
 
 def count_extended_fingers(landmarks: List[Tuple[float, float, float]]) -> int:
     """Count number of extended fingers"""
+    if len(landmarks) < 21:
+        return 0
+    return count_extended_fingers_np(np.asarray(landmarks, dtype=np.float64))
+
+
+def count_extended_fingers_np(landmarks: np.ndarray) -> int:
+    """
+    Count number of extended fingers from a (21, 3) landmark array.
+
+    Takes e.g. `HandTracker.landmarks` (float32) directly, without the
+    per-call conversion `count_extended_fingers` does for a list.
+    """
     if len(landmarks) < 21:
         return 0
     
-    landmarks_array = np.array(landmarks)
-    wrist = landmarks_array[0]
-    
-    # Finger tip and joint indices
-    fingers = {
-        'thumb': (4, 3, 2),
-        'index': (8, 6, 5),
-        'middle': (12, 10, 9),
-        'ring': (16, 14, 13),
-        'pinky': (20, 18, 17)
-    }
-    
-    extended_count = 0
-    for finger_name, (tip_idx, pip_idx, mcp_idx) in fingers.items():
-        if finger_name == 'thumb':
-            # Special case for thumb (horizontal movement)
-            if landmarks_array[tip_idx][0] < landmarks_array[pip_idx][0]:
-                extended_count += 1
-        else:
-            if is_finger_extended(
-                landmarks_array[tip_idx],
-                landmarks_array[pip_idx],
-                landmarks_array[mcp_idx],
-                wrist
-            ):
-                extended_count += 1
+    if NUMBA_AVAILABLE:
+        # Imported on first use: importing compiles / warms up the kernel,
+        # which code that never counts fingers should not pay for.
+        from utils_numba import analyze_landmarks
+        return analyze_landmarks(np.ascontiguousarray(landmarks))[0]
+    
+    lm = np.asarray(landmarks, dtype=np.float64)
+    wrist = lm[0]
+    
+    # Index..pinky: extended if the tip is farther from the wrist than the
+    # PIP joint (by 10%), all four at once and compared squared (no sqrt).
+    # Summed x, y, z in that order in float64, like `analyze_landmarks`, so
+    # both agree exactly at the threshold.
+    tips = lm[_FINGER_TIPS] - wrist
+    pips = lm[_FINGER_PIPS] - wrist
+    tip_sq = tips[:, 0] * tips[:, 0] + tips[:, 1] * tips[:, 1] + tips[:, 2] * tips[:, 2]
+    pip_sq = pips[:, 0] * pips[:, 0] + pips[:, 1] * pips[:, 1] + pips[:, 2] * pips[:, 2]
+    extended_count = int(np.count_nonzero(tip_sq > 1.21 * pip_sq))
+    
+    # Special case for thumb (horizontal movement)
+    if landmarks[4, 0] < landmarks[3, 0]:
+        extended_count += 1
     
     return extended_count
 
 
 def draw_hand_landmarks(image: np.ndarray, 
-                       landmarks: List[Tuple[float, float, float]], 
+                       landmarks: Union[List[Tuple[float, float, float]], np.ndarray], 
                        connections: List[Tuple[int, int]]) -> np.ndarray:
-    """Draw hand landmarks and connections on image"""
+    """Draw hand landmarks (a list of points or an (n, 3) array) and connections on image"""
     h, w, _ = image.shape
     
+    # Pixel coordinates of all landmarks at once (truncated like
+    # `denormalize_coordinates`), as lists of ints for OpenCV. An array is
+    # used as is; the scaling below is done in float64 either way.
+    landmarks_array = np.asarray(landmarks).reshape(-1, 3)
+    points = (landmarks_array[:, :2] * (w, h)).astype(np.int32).tolist()
+    num_points = len(points)
+    
     # Draw connections
-    for connection in connections:
-        start_idx, end_idx = connection
-        if start_idx < len(landmarks) and end_idx < len(landmarks):
-            start_point = denormalize_coordinates(
-                landmarks[start_idx][0], 
-                landmarks[start_idx][1], 
-                w, h
-            )
-            end_point = denormalize_coordinates(
-                landmarks[end_idx][0], 
-                landmarks[end_idx][1], 
-                w, h
-            )
-            cv2.line(image, start_point, end_point, (0, 255, 0), 2)
+    for start_idx, end_idx in connections:
+        if start_idx < num_points and end_idx < num_points:
+            cv2.line(image, points[start_idx], points[end_idx], _CONNECTION_COLOR, 2)
     
     # Draw landmarks
-    for landmark in landmarks:
-        point = denormalize_coordinates(landmark[0], landmark[1], w, h)
-        cv2.circle(image, point, 5, (255, 0, 0), -1)
+    for point in points:
+        cv2.circle(image, point, 5, _LANDMARK_COLOR, -1)
     
     return image
 
@@ -126,11 +149,11 @@ def draw_info_panel(image: np.ndarray,
                    gesture: str, 
                    mode: str,
                    confidence: float = 0.0) -> np.ndarray:
-    """Draw information panel on image"""
-    # Semi-transparent background
-    overlay = image.copy()
-    cv2.rectangle(overlay, (10, 10), (300, 120), (0, 0, 0), -1)
-    image = cv2.addWeighted(overlay, 0.6, image, 0.4, 0)
+    """Draw information panel on image (in place; the image is also returned)"""
+    # Semi-transparent background: 60% black over the panel area
+    # (corners (10, 10)-(300, 120) inclusive). Only the panel is touched.
+    roi = image[10:121, 10:301]
+    cv2.convertScaleAbs(roi, dst=roi, alpha=0.4)
     
     # Text information
     cv2.putText(image, f"FPS: {fps:.1f}", (20, 40), 
@@ -148,39 +171,68 @@ def draw_info_panel(image: np.ndarray,
 
 
 class MovingAverageFilter:
-    """Simple moving average filter for smoothing"""
+    """Simple moving average filter for smoothing (ring buffer + running sum)"""
+    
+    __slots__ = ("window_size", "buf", "idx", "count", "sum")
     
     def __init__(self, window_size: int = 5):
         self.window_size = window_size
-        self.values = []
+        self.buf = np.zeros(window_size, dtype=np.float64)
+        self.idx = 0
+        self.count = 0
+        self.sum = 0.0
     
     def update(self, value: float) -> float:
         """Add new value and return filtered result"""
-        self.values.append(value)
-        if len(self.values) > self.window_size:
-            self.values.pop(0)
-        return np.mean(self.values)
+        old = self.buf[self.idx]
+        self.sum += value - old
+        self.buf[self.idx] = value
+        self.idx = (self.idx + 1) % self.window_size
+        if self.idx == 0:
+            # Re-sum once per window so rounding error cannot accumulate
+            self.sum = float(self.buf.sum())
+        self.count = min(self.count + 1, self.window_size)
+        return self.sum / self.count
     
     def reset(self):
         """Reset the filter"""
-        self.values = []
+        self.buf.fill(0.0)
+        self.idx = 0
+        self.count = 0
+        self.sum = 0.0
 
 
 class FPSCounter:
     """FPS counter for performance monitoring"""
     
+    __slots__ = ("window_size", "deltas", "_prev", "_sum")
+    
     def __init__(self, window_size: int = 30):
         self.window_size = window_size
-        self.timestamps = []
-    
-    def update(self, timestamp: float) -> float:
-        """Update with new timestamp and return current FPS"""
-        self.timestamps.append(timestamp)
-        if len(self.timestamps) > self.window_size:
-            self.timestamps.pop(0)
+        # Frame intervals over the last `window_size` timestamps, and their sum
+        # (none for a window of one timestamp: the FPS then stays 0.0)
+        self.deltas = deque(maxlen=max(window_size - 1, 0))
+        self._prev: Optional[float] = None
+        self._sum = 0.0
+    
+    def update(self, timestamp: Optional[float] = None) -> float:
+        """
+        Update with new timestamp and return current FPS
+
+        Timestamps must come from one monotonic clock; `time.perf_counter()`
+        is read if none is given.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if self._prev is not None and self.deltas.maxlen:
+            d = timestamp - self._prev
+            if len(self.deltas) == self.deltas.maxlen:
+                self._sum -= self.deltas[0]
+            self.deltas.append(d)
+            self._sum += d
+        self._prev = timestamp
         
-        if len(self.timestamps) < 2:
+        if not self.deltas:
             return 0.0
         
-        time_diff = self.timestamps[-1] - self.timestamps[0]
-        return (len(self.timestamps) - 1) / (time_diff + 1e-6)
+        return len(self.deltas) / (self._sum + 1e-6)
@@ -0,0 +1,85 @@
+"""
+Compiled per-frame landmark analysis.
+
+`analyze_landmarks` computes in one pass what `utils.count_extended_fingers`,
+`utils.is_finger_extended` and `utils.calculate_angle` give piecemeal:
+which fingers are extended, how many, and the bend angle of every finger.
+
+`utils` imports this module lazily, on the first finger count, since the
+import compiles (or loads from cache) and warms up the kernel.
+
+Without Numba the kernel still runs (as plain Python), but `utils` keeps using
+its NumPy code then, which is faster than an uncompiled loop.
+"""
+
+import math
+
+import numpy as np
+
+from numba_compat import njit
+
+# (tip, pip, mcp) landmark ids per finger: thumb, index, middle, ring, pinky
+FINGER_JOINTS = ((4, 3, 2), (8, 6, 5), (12, 10, 9), (16, 14, 13), (20, 18, 17))
+
+
+# No fastmath: the extension test must match the NumPy version exactly at
+# its threshold.
+@njit(cache=True)
+def analyze_landmarks(lm):
+    """
+    Analyze one hand.
+
+    Args:
+        lm: (21, 3) contiguous array of (x, y, z) landmarks.
+
+    Returns:
+        (extended_count, finger_flags, key_angles): number of extended
+        fingers, a (5,) bool array of which ones (thumb first), and a (5,)
+        array with each finger's angle at its PIP joint (mcp-pip-tip), in
+        degrees (180 = straight).
+    """
+    flags = np.zeros(5, dtype=np.bool_)
+    angles = np.empty(5)
+    count = 0
+    for f in range(5):
+        tip, pip, mcp = FINGER_JOINTS[f]
+
+        if f == 0:
+            # Special case for thumb (horizontal movement)
+            extended = lm[tip, 0] < lm[pip, 0]
+        else:
+            # |tip - wrist| > 1.1 |pip - wrist|, compared squared (in float64
+            # for float32 input too, as `utils.count_extended_fingers_np` does)
+            tip_sq = 0.0
+            pip_sq = 0.0
+            for a in range(3):
+                dt = np.float64(lm[tip, a]) - np.float64(lm[0, a])
+                dp = np.float64(lm[pip, a]) - np.float64(lm[0, a])
+                tip_sq += dt * dt
+                pip_sq += dp * dp
+            extended = tip_sq > 1.21 * pip_sq
+        flags[f] = extended
+        if extended:
+            count += 1
+
+        # Angle at the PIP joint between the MCP and the tip
+        dot = 0.0
+        n1 = 0.0
+        n2 = 0.0
+        for a in range(3):
+            v1 = lm[mcp, a] - lm[pip, a]
+            v2 = lm[tip, a] - lm[pip, a]
+            dot += v1 * v2
+            n1 += v1 * v1
+            n2 += v2 * v2
+        cos_angle = dot / (math.sqrt(n1) * math.sqrt(n2) + 1e-6)
+        cos_angle = min(max(cos_angle, -1.0), 1.0)
+        angles[f] = math.degrees(math.acos(cos_angle))
+
+    return count, flags, angles
+
+
+# Compile (or load from cache) at import rather than on the first frame:
+# float32 for tracker landmarks, float64 for lists converted by `utils`.
+analyze_landmarks(np.zeros((21, 3), dtype=np.float32))
+analyze_landmarks(np.zeros((21, 3), dtype=np.float64))
@@ -21,6 +21,12 @@ class VolumeMode(BaseMode):
 
     def __init__(self):
         self._controller = VolumeController()
+        # Bar geometry, recomputed only when the frame size changes
+        self._cached_hw = None
+        self._bar_x = 0
+        self._bar_y = 0
+        self._bar_x2 = 0
+        self._bar_y2 = 0
 
     def on_frame(self, frame: np.ndarray, tracker, gesture: str, confidence: float) -> np.ndarray:
         pinch_distance = tracker.get_pinch_distance()
@@ -30,28 +36,37 @@ class VolumeMode(BaseMode):
         self._draw_volume_bar(frame, self._controller.get_volume())
         return frame
 
-    def _draw_volume_bar(self, frame: np.ndarray, volume: int) -> None:
-        h, w, _ = frame.shape
+    def _precompute(self, hw) -> None:
+        h, w = hw
+        self._bar_x = w - VOLUME_BAR_WIDTH - VOLUME_BAR_MARGIN_PX
+        self._bar_y = h - VOLUME_BAR_HEIGHT - VOLUME_BAR_MARGIN_PX
+        self._bar_x2 = self._bar_x + VOLUME_BAR_WIDTH
+        self._bar_y2 = self._bar_y + VOLUME_BAR_HEIGHT
+        self._cached_hw = hw
 
-        bar_x = w - VOLUME_BAR_WIDTH - VOLUME_BAR_MARGIN_PX
-        bar_y = h - VOLUME_BAR_HEIGHT - VOLUME_BAR_MARGIN_PX
+    def _draw_volume_bar(self, frame: np.ndarray, volume: int) -> None:
+        hw = frame.shape[:2]
+        if hw != self._cached_hw:
+            self._precompute(hw)
+        bar_x, bar_y = self._bar_x, self._bar_y
+        bar_x2, bar_y2 = self._bar_x2, self._bar_y2
 
-        # Background
+        # Background (only the part the fill does not cover)
+        fill_width = int((volume / 100) * VOLUME_BAR_WIDTH)
         cv2.rectangle(
             frame,
-            (bar_x, bar_y),
-            (bar_x + VOLUME_BAR_WIDTH, bar_y + VOLUME_BAR_HEIGHT),
+            (bar_x + fill_width, bar_y),
+            (bar_x2, bar_y2),
             (50, 50, 50),
             -1,
         )
 
         # Fill
-        fill_width = int((volume / 100) * VOLUME_BAR_WIDTH)
         color = (0, 255, 0) if volume > 30 else (0, 165, 255)
         cv2.rectangle(
             frame,
             (bar_x, bar_y),
-            (bar_x + fill_width, bar_y + VOLUME_BAR_HEIGHT),
+            (bar_x + fill_width, bar_y2),
             color,
             -1,
         )
@@ -60,7 +75,7 @@ class VolumeMode(BaseMode):
         cv2.rectangle(
             frame,
             (bar_x, bar_y),
-            (bar_x + VOLUME_BAR_WIDTH, bar_y + VOLUME_BAR_HEIGHT),
+            (bar_x2, bar_y2),
             (255, 255, 255),
             2,
         )